@@ -9,10 +9,39 @@ import argparse
 import sys
 from datetime import datetime, timezone
 
-from src.epic_status import fetch_all_events
+from src.epic_status import StatusEvent, fetch_all_events
 from src.filters import load_filter_config, filter_events
 from src.state import JsonFileState
-from src.notifiers import TelegramNotifier
+from src.notifiers import Notifier, TelegramNotifier
+
+
+def _count_by_type(events: list[StatusEvent]) -> tuple[int, int]:
+    """Count incidents and maintenances in a single pass."""
+    incidents = maintenances = 0
+    for event in events:
+        incidents += event.is_incident
+        maintenances += event.is_maintenance
+    return incidents, maintenances
+
+
+def _notify(
+    notifier: Notifier,
+    state: JsonFileState,
+    events: list[StatusEvent],
+    is_update: bool,
+    dry_run: bool,
+) -> int:
+    """Send a batch of notifications and mark delivered events as seen."""
+    if not events:
+        return 0
+
+    count = 0
+    results = notifier.send_batch(events, is_update=is_update)
+    for event, sent in zip(events, results):
+        if sent or dry_run:
+            state.mark_seen(event)
+            count += 1
+    return count
 
 
 def main() -> int:
@@ -30,47 +59,64 @@ def main() -> int:
     # Fetch current incidents + active/upcoming maintenances
     all_events = fetch_all_events(include_upcoming=True)
     
+    # Initialize state and notifier
+    state = JsonFileState()
+    notifier = TelegramNotifier()
+
+    # Split events by what changed since the last poll. Only new and updated
+    # events can trigger a notification, so only they go through the filters.
+    # Unchanged events are already tracked and stay tracked (not treated as
+    # resolved by cleanup) until they resolve, even if the filters have been
+    # narrowed since they were first seen.
+    unchanged_events: list[StatusEvent] = []
+    new_candidates: list[StatusEvent] = []
+    updated_candidates: list[StatusEvent] = []
+    for event in all_events:
+        if state.is_new_event(event):
+            new_candidates.append(event)
+        elif state.is_updated_event(event):
+            updated_candidates.append(event)
+        else:
+            unchanged_events.append(event)
+
     # Apply filters
-    events = filter_events(all_events, filter_config)
+    new_events = filter_events(new_candidates, filter_config)
+    updated_events = filter_events(updated_candidates, filter_config)
+    events = unchanged_events + new_events + updated_events
     
-    total_incidents = sum(1 for e in all_events if e.is_incident)
-    total_maintenance = sum(1 for e in all_events if e.is_maintenance)
-    filtered_incidents = sum(1 for e in events if e.is_incident)
-    filtered_maintenance = sum(1 for e in events if e.is_maintenance)
+    total_incidents, total_maintenance = _count_by_type(all_events)
+    filtered_incidents, filtered_maintenance = _count_by_type(events)
     
     print(f"📊 Found {total_incidents} incident(s), {total_maintenance} maintenance(s) total")
     if filter_config.services or filter_config.min_impact != "none":
-        print(f"📋 After filtering: {filtered_incidents} incident(s), {filtered_maintenance} maintenance(s)")
-
-    # Initialize state and notifier
-    state = JsonFileState()
-    notifier = TelegramNotifier()
-
-    new_count = 0
-    update_count = 0
+        print(
+            f"📋 After filtering: {filtered_incidents} incident(s), {filtered_maintenance} maintenance(s)"
+            " (including already tracked events)"
+        )
 
-    for event in events:
+    for event in new_events:
         event_type = "maintenance" if event.is_maintenance else "incident"
-        
-        if state.is_new_event(event):
-            # New event
-            print(f"🆕 New {event_type}: {event.name}")
-            sent = notifier.send_new_event(event)
-            if sent or args.dry_run:
-                state.mark_seen(event)
-                new_count += 1
+        print(f"🆕 New {event_type}: {event.name}")
+    for event in updated_events:
+        event_type = "maintenance" if event.is_maintenance else "incident"
+        print(f"🔄 Updated {event_type}: {event.name}")
 
-        elif state.is_updated_event(event):
-            # Existing event with updates
-            print(f"🔄 Updated {event_type}: {event.name}")
-            sent = notifier.send_event_update(event)
-            if sent or args.dry_run:
-                state.mark_seen(event)
-                update_count += 1
-
-    # Clean up resolved events and save state
-    state.cleanup(events)
-    state.save()
+    # Everything marked seen below is written in a single save on exit,
+    # including when a later step fails, so sent notifications aren't repeated
+    with state:
+        # Send buffered notifications in as few messages as possible
+        try:
+            new_count = _notify(notifier, state, new_events, is_update=False, dry_run=args.dry_run)
+            update_count = _notify(notifier, state, updated_events, is_update=True, dry_run=args.dry_run)
+        finally:
+            notifier.close()
+
+        # Clean up resolved events. If an endpoint failed, its events are
+        # missing or stale, so don't treat them as resolved.
+        if all_events.stale:
+            print("⚠️ Status data is incomplete, skipping cleanup of resolved events")
+        else:
+            state.cleanup(events)
 
     # Summary
     print(f"\n📈 Summary:")
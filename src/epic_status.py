@@ -3,10 +3,25 @@ Epic Games Status API client.
 Fetches and parses incident and maintenance data from status.epicgames.com.
 """
 
-from dataclasses import dataclass
-from enum import Enum
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from . import jsonutil
+from .retry import retry
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - exercised only without ijson
+    ijson = None
 
 # Statuspage.io API endpoints
 BASE_URL = "https://status.epicgames.com/api/v2"
@@ -14,6 +29,24 @@ INCIDENTS_URL = f"{BASE_URL}/incidents/unresolved.json"
 MAINTENANCE_ACTIVE_URL = f"{BASE_URL}/scheduled-maintenances/active.json"
 MAINTENANCE_UPCOMING_URL = f"{BASE_URL}/scheduled-maintenances/upcoming.json"
 
+# Shared session so all endpoint fetches reuse one keep-alive connection pool
+# (every URL above lives on the same host).
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+atexit.register(_session.close)
+
+# Seconds a fetched response is reused before the endpoint is queried again.
+# Statuspage data changes on the order of minutes, so a short TTL is safe.
+DEFAULT_CACHE_TTL = 15
+
+# Responses larger than this (in bytes) are stream-parsed with ijson, when it
+# is installed, instead of being loaded into memory in one piece. Setting
+# EPIC_STATUS_STREAM_PARSE=1 streams every response, =0 never streams.
+STREAM_PARSE_THRESHOLD = 1024 * 1024
+
+# Errors raised while decoding a response body
+_PARSE_ERRORS = (jsonutil.JSONDecodeError,) + ((ijson.JSONError,) if ijson else ())
+
 
 class EventType(Enum):
     """Type of status event."""
@@ -21,7 +54,20 @@ class EventType(Enum):
     MAINTENANCE = "maintenance"
 
 
-@dataclass
+class Impact(IntEnum):
+    """Incident impact level, ordered by severity."""
+    UNKNOWN = -1
+    NONE = 0
+    MINOR = 1
+    MAJOR = 2
+    CRITICAL = 3
+
+
+# Impact strings as used by the API, e.g. "major" -> Impact.MAJOR
+_IMPACT_BY_NAME = {impact.name.lower(): impact for impact in Impact}
+
+
+@dataclass(slots=True, frozen=True)
 class StatusUpdate:
     """A single update within an incident or maintenance."""
     id: str
@@ -30,7 +76,7 @@ class StatusUpdate:
     created_at: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Component:
     """An affected service component."""
     id: str
@@ -38,7 +84,7 @@ class Component:
     status: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StatusEvent:
     """An Epic Games status event (incident or scheduled maintenance)."""
     id: str
@@ -53,43 +99,67 @@ class StatusEvent:
     event_type: EventType
     scheduled_for: str | None = None  # For maintenance only
     scheduled_until: str | None = None  # For maintenance only
-
-    @property
-    def fingerprint(self) -> str:
-        """
-        Unique fingerprint that changes when event is updated.
-        Used to detect updates to existing events.
-        """
-        latest_update_id = self.updates[0].id if self.updates else ""
-        return f"{self.status}:{latest_update_id}"
-
-    @property
-    def latest_update(self) -> StatusUpdate | None:
-        """Get the most recent update, if any."""
-        return self.updates[0] if self.updates else None
-
-    @property
-    def component_names(self) -> list[str]:
-        """Get list of affected component names."""
-        return [c.name for c in self.components]
-
-    @property
-    def is_maintenance(self) -> bool:
-        """Check if this is a scheduled maintenance."""
-        return self.event_type == EventType.MAINTENANCE
-
-    @property
-    def is_incident(self) -> bool:
-        """Check if this is an incident."""
-        return self.event_type == EventType.INCIDENT
+    # Most recent update (Statuspage lists updates newest first), if any
+    latest_update: StatusUpdate | None = field(init=False, repr=False, compare=False)
+    # Names of affected components
+    component_names: list[str] = field(init=False, repr=False, compare=False)
+    # Changes whenever the status or latest update changes; used to detect
+    # updates to existing events
+    fingerprint: str = field(init=False, repr=False, compare=False)
+    # Derived from event_type so hot loops read a slot instead of comparing enums
+    is_incident: bool = field(init=False, repr=False, compare=False)
+    is_maintenance: bool = field(init=False, repr=False, compare=False)
+    # Parsed impact, for numeric comparisons; unrecognized impacts are UNKNOWN
+    impact_rank: Impact = field(init=False, repr=False, compare=False)
+    # Lowercased event name and component names, used for keyword matching
+    search_text: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Frozen dataclass, so derived fields are set through object.__setattr__
+        latest_update = self.updates[0] if self.updates else None
+        component_names = [c.name for c in self.components]
+        is_incident = self.event_type is EventType.INCIDENT
+        object.__setattr__(self, "latest_update", latest_update)
+        object.__setattr__(self, "component_names", component_names)
+        object.__setattr__(self, "fingerprint", f"{self.status}:{latest_update.id if latest_update else ''}")
+        object.__setattr__(self, "is_incident", is_incident)
+        object.__setattr__(self, "is_maintenance", not is_incident)
+        object.__setattr__(self, "impact_rank", _IMPACT_BY_NAME.get(self.impact, Impact.UNKNOWN))
+        object.__setattr__(self, "search_text", f"{self.name} {' '.join(component_names)}".lower())
+
+
+# Parsed events keyed by _parse_key, so unchanged events in a re-downloaded
+# response are reused instead of rebuilt. Oldest entries are evicted first.
+# The same instance is returned to every caller, and while StatusEvent is
+# frozen its updates/components lists are not, so callers must not mutate
+# them. Fetches run on worker threads, hence the lock.
+_PARSE_CACHE: dict[tuple, StatusEvent] = {}
+_PARSE_CACHE_LOCK = threading.Lock()
+PARSE_CACHE_SIZE = 512
+
+
+def _parse_key(data: dict, raw_updates: list, event_type: EventType) -> tuple | None:
+    """Cache key for raw event data, or None if it can't be identified reliably."""
+    event_id = data.get("id")
+    updated_at = data.get("updated_at")
+    if not event_id or not updated_at:
+        return None
+    latest_update_id = raw_updates[0].get("id", "") if raw_updates else ""
+    return (event_type, event_id, updated_at, data.get("status"), latest_update_id)
 
 
 def _parse_event(data: dict, event_type: EventType) -> StatusEvent:
     """Parse raw API data into a StatusEvent object."""
-    # Handle both incident_updates and scheduled_maintenance_updates
-    updates_key = "incident_updates" if event_type == EventType.INCIDENT else "incident_updates"
-    raw_updates = data.get(updates_key, [])
-    
+    # Statuspage uses "incident_updates" for scheduled maintenances too
+    raw_updates = data.get("incident_updates", [])
+
+    key = _parse_key(data, raw_updates, event_type)
+    if key is not None:
+        with _PARSE_CACHE_LOCK:
+            cached = _PARSE_CACHE.get(key)
+        if cached is not None:
+            return cached
+
     updates = [
         StatusUpdate(
             id=u.get("id", ""),
@@ -109,7 +179,7 @@ def _parse_event(data: dict, event_type: EventType) -> StatusEvent:
         for c in data.get("components", [])
     ]
 
-    return StatusEvent(
+    event = StatusEvent(
         id=data.get("id", ""),
         name=data.get("name", "Unknown Event"),
         status=data.get("status", "unknown"),
@@ -124,85 +194,219 @@ def _parse_event(data: dict, event_type: EventType) -> StatusEvent:
         scheduled_until=data.get("scheduled_until"),
     )
 
+    if key is not None:
+        with _PARSE_CACHE_LOCK:
+            if key not in _PARSE_CACHE and len(_PARSE_CACHE) >= PARSE_CACHE_SIZE:
+                del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+            _PARSE_CACHE[key] = event
+    return event
 
-def _fetch_from_url(url: str, key: str, event_type: EventType, timeout: int = 30) -> list[StatusEvent]:
-    """Fetch events from a specific API URL."""
+
+class EventList(list):
+    """
+    A list of StatusEvents that remembers whether it is complete.
+
+    ``stale`` is True when at least one endpoint could not be fetched and
+    previously cached (or no) events were returned in its place.
+    """
+    stale: bool = False
+
+
+def _merge_results(results: list[EventList]) -> EventList:
+    """Concatenate fetch results, marking the merged list stale if any part was."""
+    merged = EventList(event for result in results for event in result)
+    merged.stale = any(result.stale for result in results)
+    return merged
+
+
+@dataclass(slots=True)
+class _CachedResponse:
+    """Last successful response for an endpoint."""
+    fetched_at: float
+    etag: str | None
+    last_modified: str | None
+    events: list[StatusEvent]
+
+
+# Per-URL response cache, see _fetch_from_url.
+_CACHE: dict[str, _CachedResponse] = {}
+
+
+def clear_cache() -> None:
+    """Drop all cached API responses and parsed events."""
+    _CACHE.clear()
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE.clear()
+
+
+def _should_stream_parse(resp: requests.Response) -> bool:
+    """Whether to parse a response incrementally with ijson."""
+    if ijson is None:
+        return False
+    setting = os.environ.get("EPIC_STATUS_STREAM_PARSE")
+    if setting is not None:
+        return setting == "1"
     try:
-        resp = requests.get(url, timeout=timeout)
-        resp.raise_for_status()
-        raw_events = resp.json().get(key, [])
-        return [_parse_event(data, event_type) for data in raw_events]
-    except (requests.RequestException, ConnectionError, TimeoutError) as e:
-        print(f"❌ Failed to fetch from {url}: {e}")
-        return []
+        length = int(resp.headers.get("Content-Length") or 0)
+    except ValueError:
+        # Malformed header; the size is unknown, so load the body normally
+        return False
+    return length > STREAM_PARSE_THRESHOLD
+
+
+def _parse_response(resp: requests.Response, key: str, event_type: EventType) -> list[StatusEvent]:
+    """Parse the events under ``key`` from a streamed API response."""
+    if _should_stream_parse(resp):
+        # Build events one at a time instead of materializing the whole body
+        resp.raw.decode_content = True
+        try:
+            return [_parse_event(data, event_type) for data in ijson.items(resp.raw, f"{key}.item")]
+        except urllib3.exceptions.HTTPError as e:
+            # Reading resp.raw directly bypasses the wrapping requests applies
+            # in iter_content, so a connection dropped mid-body surfaces as a
+            # raw urllib3 error
+            raise requests.exceptions.ChunkedEncodingError(e) from e
+
+    raw_events = jsonutil.loads(resp.content).get(key, [])
+    return [_parse_event(data, event_type) for data in raw_events]
+
+
+def _fetch_from_url(
+    url: str,
+    key: str,
+    event_type: EventType,
+    timeout: int = 30,
+    ttl: float = DEFAULT_CACHE_TTL,
+) -> EventList:
+    """
+    Fetch events from a specific API URL.
+
+    Responses younger than ``ttl`` seconds are served from memory. Older
+    entries are revalidated with ``If-None-Match`` / ``If-Modified-Since`` so
+    an unchanged endpoint answers 304 and skips JSON parsing. Transient errors
+    are retried with backoff; if the request still fails, the last cached
+    events are returned when available and the result is marked ``stale``.
+    """
+    now = time.monotonic()
+    cached = _CACHE.get(url)
+    if cached and now - cached.fetched_at < ttl:
+        return EventList(cached.events)
+
+    headers = {}
+    if cached:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    try:
+        with retry(lambda: _session.get(url, timeout=timeout, headers=headers, stream=True)) as resp:
+            if resp.status_code == 304 and cached:
+                cached.fetched_at = now
+                return EventList(cached.events)
+            resp.raise_for_status()
+            events = _parse_response(resp, key, event_type)
+    except (requests.RequestException, ConnectionError, TimeoutError, *_PARSE_ERRORS) as e:
+        if cached:
+            print(f"⚠️ Failed to fetch from {url}: {e}, using cached data")
+        else:
+            print(f"❌ Failed to fetch from {url}: {e}")
+        result = EventList(cached.events if cached else [])
+        result.stale = True
+        return result
+
+    _CACHE[url] = _CachedResponse(
+        fetched_at=now,
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+        events=events,
+    )
+    return EventList(events)
 
 
-def fetch_incidents(timeout: int = 30) -> list[StatusEvent]:
+def fetch_incidents(timeout: int = 30, ttl: float = DEFAULT_CACHE_TTL) -> EventList:
     """
     Fetch unresolved incidents from Epic Games status API.
     
     Args:
         timeout: Request timeout in seconds.
+        ttl: Seconds a cached response is reused before refetching.
         
     Returns:
         List of StatusEvent objects (incidents only).
     """
-    return _fetch_from_url(INCIDENTS_URL, "incidents", EventType.INCIDENT, timeout)
+    return _fetch_from_url(INCIDENTS_URL, "incidents", EventType.INCIDENT, timeout, ttl)
 
 
-def fetch_active_maintenances(timeout: int = 30) -> list[StatusEvent]:
+def fetch_active_maintenances(timeout: int = 30, ttl: float = DEFAULT_CACHE_TTL) -> EventList:
     """
     Fetch active scheduled maintenances from Epic Games status API.
     
     Args:
         timeout: Request timeout in seconds.
+        ttl: Seconds a cached response is reused before refetching.
         
     Returns:
         List of StatusEvent objects (active maintenances only).
     """
-    return _fetch_from_url(MAINTENANCE_ACTIVE_URL, "scheduled_maintenances", EventType.MAINTENANCE, timeout)
+    return _fetch_from_url(MAINTENANCE_ACTIVE_URL, "scheduled_maintenances", EventType.MAINTENANCE, timeout, ttl)
 
 
-def fetch_upcoming_maintenances(timeout: int = 30) -> list[StatusEvent]:
+def fetch_upcoming_maintenances(timeout: int = 30, ttl: float = DEFAULT_CACHE_TTL) -> EventList:
     """
     Fetch upcoming scheduled maintenances from Epic Games status API.
     
     Args:
         timeout: Request timeout in seconds.
+        ttl: Seconds a cached response is reused before refetching.
         
     Returns:
         List of StatusEvent objects (upcoming maintenances only).
     """
-    return _fetch_from_url(MAINTENANCE_UPCOMING_URL, "scheduled_maintenances", EventType.MAINTENANCE, timeout)
+    return _fetch_from_url(MAINTENANCE_UPCOMING_URL, "scheduled_maintenances", EventType.MAINTENANCE, timeout, ttl)
+
+
+def _fetch_concurrently(fetchers: list, timeout: int, ttl: float) -> EventList:
+    """Run endpoint fetchers concurrently and merge their results in order."""
+    # Endpoints are independent and network-bound, so fetch them concurrently.
+    # Results are collected in submission order to keep the output stable.
+    with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+        futures = [executor.submit(fetcher, timeout, ttl) for fetcher in fetchers]
+        return _merge_results([future.result() for future in futures])
 
 
-def fetch_all_active_events(timeout: int = 30) -> list[StatusEvent]:
+def fetch_all_active_events(timeout: int = 30, ttl: float = DEFAULT_CACHE_TTL) -> EventList:
     """
     Fetch all active events: unresolved incidents + active maintenances.
     
     Args:
         timeout: Request timeout in seconds.
+        ttl: Seconds a cached response is reused before refetching.
         
     Returns:
-        List of all active StatusEvent objects.
+        List of all active StatusEvent objects, marked ``stale`` if any
+        endpoint could not be fetched.
     """
-    incidents = fetch_incidents(timeout)
-    maintenances = fetch_active_maintenances(timeout)
-    return incidents + maintenances
+    return _fetch_concurrently([fetch_incidents, fetch_active_maintenances], timeout, ttl)
 
 
-def fetch_all_events(include_upcoming: bool = True, timeout: int = 30) -> list[StatusEvent]:
+def fetch_all_events(
+    include_upcoming: bool = True,
+    timeout: int = 30,
+    ttl: float = DEFAULT_CACHE_TTL,
+) -> EventList:
     """
     Fetch all events: incidents + active maintenances + optionally upcoming maintenances.
     
     Args:
         include_upcoming: Whether to include upcoming scheduled maintenances.
         timeout: Request timeout in seconds.
+        ttl: Seconds a cached response is reused before refetching.
         
     Returns:
-        List of all StatusEvent objects.
+        List of all StatusEvent objects, marked ``stale`` if any endpoint
+        could not be fetched.
     """
-    events = fetch_all_active_events(timeout)
+    fetchers = [fetch_incidents, fetch_active_maintenances]
     if include_upcoming:
-        events += fetch_upcoming_maintenances(timeout)
-    return events
+        fetchers.append(fetch_upcoming_maintenances)
+    return _fetch_concurrently(fetchers, timeout, ttl)
@@ -3,21 +3,33 @@ Event filtering system.
 Allows subscribing to specific services, impact levels, and event types.
 """
 
-import json
 import os
+import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable
 
-from .epic_status import StatusEvent, EventType
+from . import jsonutil
+from .epic_status import StatusEvent, EventType, Impact
 
 
-@dataclass
+# Searches an event's search text for keywords, see _keyword_search
+KeywordSearch = Callable[[str], object]
+
+
+@dataclass(slots=True, frozen=True)
 class FilterConfig:
-    """Configuration for filtering status events."""
+    """
+    Configuration for filtering status events.
+    Frozen, since the matchers built from it would not see later changes.
+    Keyword lists are stored as tuples for the same reason; lists (or None,
+    as from a config file) are accepted and converted.
+    """
     
     # Services to monitor (empty = all)
     # Examples: ["Fortnite", "Epic Games Store", "Rocket League"]
-    services: list[str] = field(default_factory=list)
+    services: tuple[str, ...] = ()
     
     # Minimum impact level to notify (for incidents)
     # Options: "none", "minor", "major", "critical"
@@ -30,52 +42,147 @@ class FilterConfig:
     
     # Keywords to always include (regardless of other filters)
     # Useful for specific game modes: ["LEGO Fortnite", "Rocket Racing"]
-    always_include_keywords: list[str] = field(default_factory=list)
+    always_include_keywords: tuple[str, ...] = ()
     
     # Keywords to always exclude
-    exclude_keywords: list[str] = field(default_factory=list)
+    exclude_keywords: tuple[str, ...] = ()
+
+    # Keyword search functions over StatusEvent.search_text, built in __post_init__
+    _exclude_search: KeywordSearch | None = field(init=False, repr=False, compare=False, default=None)
+    _include_search: KeywordSearch | None = field(init=False, repr=False, compare=False, default=None)
+    _services_search: KeywordSearch | None = field(init=False, repr=False, compare=False, default=None)
+    # Lowest impact rank accepted per event type, or None if the type is
+    # filtered out, built in __post_init__
+    _min_rank_by_type: dict[EventType, int | None] = field(init=False, repr=False, compare=False, default_factory=dict)
+    # Predicate specialized to the filters above, see _build_matcher
+    _match: Callable[[StatusEvent], bool] | None = field(init=False, repr=False, compare=False, default=None)
 
     IMPACT_LEVELS = ["none", "minor", "major", "critical"]
 
+    def __post_init__(self):
+        if self.min_impact not in self.IMPACT_LEVELS:
+            raise ValueError(f"Unknown min_impact {self.min_impact!r}, expected one of {self.IMPACT_LEVELS}")
+
+        services = tuple(self.services or ())
+        always_include_keywords = tuple(self.always_include_keywords or ())
+        exclude_keywords = tuple(self.exclude_keywords or ())
+
+        # Turn each keyword list into a single search over the event's
+        # search text, however many keywords it holds.
+        exclude_search = _keyword_search(exclude_keywords)
+        include_search = _keyword_search(always_include_keywords)
+        services_search = _keyword_search(services)
+
+        # Bucket the type and impact filters by event type, so each event is
+        # checked with one lookup and one comparison. The impact filter only
+        # applies to incidents, and Impact.UNKNOWN is the lowest possible rank.
+        min_incident_rank = Impact[self.min_impact.upper()]
+        if min_incident_rank == Impact.NONE:
+            # "none" accepts every incident, including unknown impacts
+            min_incident_rank = Impact.UNKNOWN
+        min_rank_by_type = {
+            EventType.INCIDENT: None if self.event_types == "maintenance" else min_incident_rank,
+            EventType.MAINTENANCE: None if self.event_types == "incidents" else Impact.UNKNOWN,
+        }
+
+        # Store the keyword snapshots, the prebuilt searches and the matcher
+        # combining them
+        object.__setattr__(self, "services", services)
+        object.__setattr__(self, "always_include_keywords", always_include_keywords)
+        object.__setattr__(self, "exclude_keywords", exclude_keywords)
+        object.__setattr__(self, "_exclude_search", exclude_search)
+        object.__setattr__(self, "_include_search", include_search)
+        object.__setattr__(self, "_services_search", services_search)
+        object.__setattr__(self, "_min_rank_by_type", min_rank_by_type)
+        object.__setattr__(
+            self, "_match", _build_matcher(exclude_search, include_search, services_search, min_rank_by_type)
+        )
+
     def matches(self, event: StatusEvent) -> bool:
         """Check if an event matches this filter configuration."""
-        
-        # Check exclusions first
-        if self.exclude_keywords:
-            event_text = f"{event.name} {' '.join(event.component_names)}".lower()
-            for keyword in self.exclude_keywords:
-                if keyword.lower() in event_text:
-                    return False
-        
-        # Check always-include keywords
-        if self.always_include_keywords:
-            event_text = f"{event.name} {' '.join(event.component_names)}".lower()
-            for keyword in self.always_include_keywords:
-                if keyword.lower() in event_text:
-                    return True
-        
-        # Check event type
-        if self.event_types == "incidents" and event.is_maintenance:
-            return False
-        if self.event_types == "maintenance" and event.is_incident:
-            return False
-        
-        # Check impact level (for incidents only)
-        if event.is_incident and self.min_impact != "none":
-            event_impact_idx = self.IMPACT_LEVELS.index(event.impact) if event.impact in self.IMPACT_LEVELS else 0
-            min_impact_idx = self.IMPACT_LEVELS.index(self.min_impact)
-            if event_impact_idx < min_impact_idx:
+        return self._match(event)
+
+
+def _build_matcher(
+    exclude: KeywordSearch | None,
+    include: KeywordSearch | None,
+    services: KeywordSearch | None,
+    min_rank_by_type: dict[EventType, int | None],
+) -> Callable[[StatusEvent], bool]:
+    """
+    Build the match predicate for a FilterConfig.
+
+    The keyword searches are bound to closure variables once, so a match
+    reads locals instead of looking up attributes on the config, and the
+    always-include branch is only present when such keywords are set.
+    """
+    if include is None:
+        def match(event: StatusEvent) -> bool:
+            # Nothing can bypass the event type and impact filters, so reject
+            # on those cheap comparisons before any keyword search
+            min_rank = min_rank_by_type[event.event_type]
+            if min_rank is None or event.impact_rank < min_rank:
+                return False
+
+            text = event.search_text
+            if exclude and exclude(text):
                 return False
-        
-        # Check services filter
-        if self.services:
+
             # Match if event name or any component matches a watched service
-            event_text = f"{event.name} {' '.join(event.component_names)}".lower()
-            matched = any(service.lower() in event_text for service in self.services)
-            if not matched:
+            return not services or bool(services(text))
+    else:
+        def match(event: StatusEvent) -> bool:
+            # Check exclusions first, they win over always-include keywords
+            text = event.search_text
+            if exclude and exclude(text):
+                return False
+
+            # Always-include keywords bypass every other filter
+            if include(text):
+                return True
+
+            min_rank = min_rank_by_type[event.event_type]
+            if min_rank is None or event.impact_rank < min_rank:
                 return False
-        
-        return True
+
+            # Match if event name or any component matches a watched service
+            return not services or bool(services(text))
+
+    return match
+
+
+def _keyword_search(keywords: tuple[str, ...]) -> KeywordSearch | None:
+    """
+    Build a substring search for StatusEvent.search_text, or None if there
+    are no keywords. The search returns a truthy value if any keyword occurs.
+
+    search_text is already lowercased, so keywords are lowercased here once
+    instead of folding case on every search. Keywords that differ only in
+    case are matched once. A single keyword is a plain ``in`` test; several
+    are compiled into one regex alternation, which scans the text once
+    however many keywords there are.
+    """
+    unique = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+    if not unique:
+        return None
+    if len(unique) == 1:
+        keyword = unique[0]
+        return lambda text: keyword in text
+    return re.compile("|".join(re.escape(keyword) for keyword in unique)).search
+
+
+@lru_cache(maxsize=1)
+def _resolve_config_path(explicit: str | None, env_path: str | None) -> Path | None:
+    """Resolve which config file to use, or None if there is none."""
+    if explicit is not None:
+        return Path(explicit)
+    if env_path is not None:
+        return Path(env_path)
+
+    default_path = Path(__file__).parent.parent / "config.json"
+    if default_path.exists():
+        return default_path
+    return None
 
 
 def load_filter_config(config_path: Path | str | None = None) -> FilterConfig:
@@ -87,15 +194,14 @@ def load_filter_config(config_path: Path | str | None = None) -> FilterConfig:
     2. CONFIG_FILE environment variable
     3. config.json in project root
     4. Default (no filtering)
+
+    A config file is only re-read when its modification time changes.
     """
     # Determine config path
-    if config_path is None:
-        config_path = os.environ.get("CONFIG_FILE")
-    
-    if config_path is None:
-        default_path = Path(__file__).parent.parent / "config.json"
-        if default_path.exists():
-            config_path = default_path
+    config_path = _resolve_config_path(
+        str(config_path) if config_path is not None else None,
+        os.environ.get("CONFIG_FILE"),
+    )
     
     if config_path is None:
         # Check environment variables for simple config
@@ -106,27 +212,39 @@ def load_filter_config(config_path: Path | str | None = None) -> FilterConfig:
         return FilterConfig()
     
     # Load from file
-    config_path = Path(config_path)
-    if not config_path.exists():
+    try:
+        mtime = config_path.stat().st_mtime_ns
+    except OSError:
         print(f"⚠️ Config file not found: {config_path}, using defaults")
         return FilterConfig()
-    
+
     try:
-        with open(config_path, "r") as f:
-            data = json.load(f)
-        
-        return FilterConfig(
-            services=data.get("services", []),
-            min_impact=data.get("min_impact", "none"),
-            event_types=data.get("event_types", "all"),
-            always_include_keywords=data.get("always_include_keywords", []),
-            exclude_keywords=data.get("exclude_keywords", []),
-        )
-    except (json.JSONDecodeError, KeyError) as e:
+        return _load_config_file(config_path, mtime)
+    except (jsonutil.JSONDecodeError, KeyError, ValueError) as e:
         print(f"⚠️ Error loading config: {e}, using defaults")
         return FilterConfig()
 
 
+@lru_cache(maxsize=8)
+def _load_config_file(config_path: Path, mtime_ns: int) -> FilterConfig:
+    """
+    Parse a config file.
+
+    Cached on the file's modification time, so an unchanged file is only
+    read once. Invalid files raise and are therefore never cached.
+    """
+    data = jsonutil.loads(config_path.read_bytes())
+
+    return FilterConfig(
+        services=data.get("services", []),
+        min_impact=data.get("min_impact", "none"),
+        event_types=data.get("event_types", "all"),
+        always_include_keywords=data.get("always_include_keywords", []),
+        exclude_keywords=data.get("exclude_keywords", []),
+    )
+
+
 def filter_events(events: list[StatusEvent], config: FilterConfig) -> list[StatusEvent]:
     """Filter events based on configuration."""
-    return [event for event in events if config.matches(event)]
+    # Drive the loop from C with the bound matches() as the predicate
+    return list(filter(config.matches, events))
@@ -0,0 +1,38 @@
+"""
+JSON helpers.
+Uses orjson when it is installed and falls back to the stdlib json module.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch this one name regardless of which backend is active.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes | str):
+    """Parse a JSON document from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON.
+
+    Args:
+        obj: The object to serialize.
+        indent: Pretty-print with a two-space indent.
+
+    Returns:
+        The encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
@@ -1,5 +1,6 @@
 """Base notifier interface."""
 
+import asyncio
 from abc import ABC, abstractmethod
 
 from ..epic_status import StatusEvent
@@ -48,3 +49,41 @@ class Notifier(ABC):
         if is_update:
             return self.send_event_update(event)
         return self.send_new_event(event)
+
+    def send_batch(self, events: list[StatusEvent], is_update: bool = False) -> list[bool]:
+        """
+        Send notifications for several events.
+
+        Backends that can combine events into fewer messages override this;
+        the default sends one notification per event.
+
+        Args:
+            events: The events to notify about.
+            is_update: Whether these are updates to existing events.
+
+        Returns:
+            Per-event success flags, in the same order as ``events``.
+        """
+        return [self.send(event, is_update=is_update) for event in events]
+
+    async def send_new_event_async(self, event: StatusEvent) -> bool:
+        """
+        Async variant of send_new_event for callers already in an event loop.
+
+        The blocking send runs in a worker thread, so several events can be
+        sent concurrently with asyncio.gather.
+        """
+        return await asyncio.to_thread(self.send_new_event, event)
+
+    async def send_event_update_async(self, event: StatusEvent) -> bool:
+        """Async variant of send_event_update, see send_new_event_async."""
+        return await asyncio.to_thread(self.send_event_update, event)
+
+    def close(self) -> None:
+        """Release any resources held by the notifier, e.g. HTTP connections."""
+
+    def __enter__(self) -> "Notifier":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
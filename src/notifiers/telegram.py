@@ -1,13 +1,27 @@
 """Telegram notification backend."""
 
+import html
 import os
 import re
+from functools import lru_cache
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from .. import jsonutil
+from ..retry import CONNECTION_RETRY_EXCEPTIONS, RATE_LIMIT_STATUS_CODES, retry
 from ..epic_status import StatusEvent, EventType
 from .base import Notifier
 
+# Matches HTML tags, for printing messages to the console
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+
+@lru_cache(maxsize=1)
+def _telegram_env() -> tuple[str | None, str | None]:
+    """Read the Telegram token and chat ID from the environment, once per process."""
+    return os.environ.get("TELEGRAM_TOKEN"), os.environ.get("TELEGRAM_CHAT_ID")
+
 
 class TelegramNotifier(Notifier):
     """Send notifications via Telegram Bot API."""
@@ -26,6 +40,18 @@ class TelegramNotifier(Notifier):
         "completed": "✅",
     }
 
+    # Human-readable status labels, e.g. "in_progress" -> "In Progress"
+    STATUS_DISPLAY = {status: status.replace("_", " ").title() for status in STATUS_EMOJI}
+
+    # Telegram rejects messages longer than this
+    MAX_MESSAGE_LENGTH = 4096
+
+    # Update bodies longer than this are cut short with "..."
+    MAX_BODY_LENGTH = 500
+
+    # Placed between events that share one batched message
+    BATCH_SEPARATOR = "\n\n---\n\n"
+
     IMPACT_EMOJI = {
         "none": "⚪",
         "minor": "🟡",
@@ -39,6 +65,7 @@ class TelegramNotifier(Notifier):
         token: str | None = None,
         chat_id: str | None = None,
         timeout: int = 30,
+        connection_pool_size: int = 8,
     ):
         """
         Initialize Telegram notifier.
@@ -47,25 +74,38 @@ class TelegramNotifier(Notifier):
             token: Bot token from @BotFather. Falls back to TELEGRAM_TOKEN env var.
             chat_id: Chat ID to send messages to. Falls back to TELEGRAM_CHAT_ID env var.
             timeout: Request timeout in seconds.
+            connection_pool_size: Maximum keep-alive connections to the Telegram API.
         """
-        self.token = token or os.environ.get("TELEGRAM_TOKEN")
-        self.chat_id = chat_id or os.environ.get("TELEGRAM_CHAT_ID")
+        env_token, env_chat_id = _telegram_env()
+        self.token = token or env_token
+        self.chat_id = chat_id or env_chat_id
         self.timeout = timeout
+        # Reuse keep-alive connections across sends instead of paying a
+        # fresh TLS handshake per message. The pool is separate from the
+        # status fetcher's, so slow fetches can't hold up sends.
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=connection_pool_size))
+        self._session.headers.update({"Content-Type": "application/json"})
 
     @property
     def is_configured(self) -> bool:
         """Check if Telegram credentials are configured."""
         return bool(self.token and self.chat_id)
 
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        self._session.close()
+
+    def _status_display(self, status: str) -> str:
+        """Get the display label for a status."""
+        display = self.STATUS_DISPLAY.get(status)
+        if display is None:
+            display = status.replace("_", " ").title()
+        return display
+
     def _format_message(self, event: StatusEvent, is_update: bool = False) -> str:
         """Format an event into a Telegram message."""
         status_emoji = self.STATUS_EMOJI.get(event.status, "🚨")
-        
-        # Use maintenance impact for maintenance events
-        if event.is_maintenance:
-            impact_emoji = self.IMPACT_EMOJI.get("maintenance", "🔵")
-        else:
-            impact_emoji = self.IMPACT_EMOJI.get(event.impact, "⚪")
 
         # Header based on event type and whether it's an update
         if is_update:
@@ -78,12 +118,13 @@ class TelegramNotifier(Notifier):
         lines = [
             header,
             "",
-            f"{status_emoji} <b>{event.name}</b>",
-            f"Status: {event.status.replace('_', ' ').title()}",
+            f"{status_emoji} <b>{html.escape(event.name)}</b>",
+            f"Status: {self._status_display(event.status)}",
         ]
         
         # Show impact for incidents only
         if event.is_incident:
+            impact_emoji = self.IMPACT_EMOJI.get(event.impact, "⚪")
             lines.append(f"Impact: {impact_emoji} {event.impact.title()}")
         
         # Show scheduled time for maintenance
@@ -96,17 +137,18 @@ class TelegramNotifier(Notifier):
                 lines.append(f"⏰ Scheduled: {scheduled[:16].replace('T', ' ')} UTC")
 
         # Add latest update body if available
-        if event.latest_update and event.latest_update.body:
-            body = event.latest_update.body
-            # Truncate long messages
-            if len(body) > 500:
-                body = body[:497] + "..."
+        latest_update = event.latest_update
+        if latest_update and latest_update.body:
+            body = latest_update.body
+            # Truncate long messages before they are formatted into the message
+            if len(body) > self.MAX_BODY_LENGTH:
+                body = body[:self.MAX_BODY_LENGTH - 3] + "..."
             lines.append("")
-            lines.append(f"📋 <i>{body}</i>")
+            lines.append(f"📋 <i>{html.escape(body)}</i>")
 
         # Add affected components
         if event.component_names:
-            components = ", ".join(event.component_names[:5])
+            components = html.escape(", ".join(event.component_names[:5]))
             lines.append("")
             lines.append(f"🎮 Affected: {components}")
 
@@ -119,14 +161,25 @@ class TelegramNotifier(Notifier):
 
     def _send_message(self, message: str) -> bool:
         """Send a message via Telegram API."""
+        status = self._deliver(message)
+        return status is not None and status < 400
+
+    def _deliver(self, message: str) -> int | None:
+        """
+        Send a message via Telegram API.
+
+        Returns:
+            The HTTP status of Telegram's final response, or None if the
+            message was not sent or no response arrived.
+        """
         if not self.is_configured:
             print("⚠️ Telegram not configured, printing message instead:")
             print("-" * 50)
-            # Strip HTML tags for console output
-            clean_message = re.sub(r'<[^>]+>', '', message)
+            # Strip HTML tags and entities for console output
+            clean_message = html.unescape(_HTML_TAG_RE.sub('', message))
             print(clean_message)
             print("-" * 50)
-            return False
+            return None
 
         url = f"https://api.telegram.org/bot{self.token}/sendMessage"
         payload = {
@@ -136,14 +189,26 @@ class TelegramNotifier(Notifier):
             "disable_web_page_preview": True,
         }
 
+        data = jsonutil.dumps(payload)
+
         try:
-            resp = requests.post(url, json=payload, timeout=self.timeout)
+            # sendMessage isn't idempotent: only retry connection failures
+            # and rate limiting, where the message was most likely not
+            # delivered, to keep duplicates rare
+            resp = retry(
+                lambda: self._session.post(url, data=data, timeout=self.timeout),
+                retry_statuses=RATE_LIMIT_STATUS_CODES,
+                retry_exceptions=CONNECTION_RETRY_EXCEPTIONS,
+            )
             resp.raise_for_status()
-            print("✅ Telegram message sent successfully")
-            return True
+        except requests.HTTPError as e:
+            print(f"❌ Failed to send Telegram message: {e}")
+            return e.response.status_code
         except (requests.RequestException, ConnectionError, TimeoutError) as e:
             print(f"❌ Failed to send Telegram message: {e}")
-            return False
+            return None
+        print("✅ Telegram message sent successfully")
+        return resp.status_code
 
     def send_new_event(self, event: StatusEvent) -> bool:
         """Send notification for a new event."""
@@ -154,3 +219,44 @@ class TelegramNotifier(Notifier):
         """Send notification for an updated event."""
         message = self._format_message(event, is_update=True)
         return self._send_message(message)
+
+    def send_batch(self, events: list[StatusEvent], is_update: bool = False) -> list[bool]:
+        """
+        Send notifications for several events in as few messages as possible.
+
+        Formatted events are packed into messages up to MAX_MESSAGE_LENGTH.
+        An event whose message alone exceeds the limit is sent on its own.
+        If Telegram rejects a combined message outright (a 4xx other than
+        429), its events are re-sent one at a time, so a single event Telegram
+        can't accept doesn't block the others.
+
+        Args:
+            events: The events to notify about.
+            is_update: Whether these are updates to existing events.
+
+        Returns:
+            Per-event success flags, in the same order as ``events``.
+        """
+        messages = [self._format_message(event, is_update=is_update) for event in events]
+        separator = self.BATCH_SEPARATOR
+        results: list[bool] = []
+
+        start = 0
+        while start < len(messages):
+            end = start + 1
+            length = len(messages[start])
+            while end < len(messages) and length + len(separator) + len(messages[end]) <= self.MAX_MESSAGE_LENGTH:
+                length += len(separator) + len(messages[end])
+                end += 1
+
+            chunk = messages[start:end]
+            status = self._deliver(separator.join(chunk))
+            rejected = status is not None and 400 <= status < 500 and status not in RATE_LIMIT_STATUS_CODES
+            if len(chunk) > 1 and rejected:
+                print(f"⚠️ Batched message rejected, sending {len(chunk)} events individually")
+                results.extend(self._send_message(message) for message in chunk)
+            else:
+                results.extend([status is not None and status < 400] * len(chunk))
+            start = end
+
+        return results
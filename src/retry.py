@@ -0,0 +1,86 @@
+"""
+Retry helper for HTTP requests.
+Retries transient failures with capped exponential backoff and jitter.
+"""
+
+import random
+import time
+from typing import Callable, Collection
+
+import requests
+
+# Rate limiting and server-side errors are worth retrying; other 4xx are not
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Network errors worth retrying. The builtin errors cover low-level socket
+# failures that surface without being wrapped by requests.
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError)
+
+# Narrower sets for requests that are not idempotent, such as sending a
+# message. A read timeout or a 5xx usually means the server already acted on
+# the request, so those are not retried. Connection errors are: most happen
+# before anything is sent (ConnectTimeout is one of them). They also cover a
+# connection dropped after the request went out ("Connection aborted"), so a
+# retry can still occasionally repeat the request. A 429 means it was rejected.
+CONNECTION_RETRY_EXCEPTIONS = (requests.ConnectionError,)
+RATE_LIMIT_STATUS_CODES = frozenset({429})
+
+
+def _retry_after(resp: requests.Response) -> float | None:
+    """Seconds to wait from a Retry-After header, if it holds a number."""
+    try:
+        return max(0.0, float(resp.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+def retry(
+    request: Callable[[], requests.Response],
+    *,
+    max_retries: int = 3,
+    base: float = 1.0,
+    cap: float = 30.0,
+    jitter: float = 0.5,
+    retry_statuses: Collection[int] = RETRY_STATUS_CODES,
+    retry_exceptions: tuple[type[BaseException], ...] = RETRY_EXCEPTIONS,
+) -> requests.Response:
+    """
+    Make an HTTP request, retrying transient failures.
+
+    By default, network errors and 429/5xx responses are retried up to
+    ``max_retries`` times, waiting ``min(cap, base * 2**attempt)`` seconds
+    plus up to ``jitter`` of that again, or the server's Retry-After if given.
+
+    Args:
+        request: Zero-argument callable that performs the request.
+        max_retries: Retries after the first attempt.
+        base: Delay before the first retry, in seconds.
+        cap: Upper bound on the backoff delay, in seconds.
+        jitter: Maximum random extra delay, as a fraction of the backoff.
+        retry_statuses: Response status codes to retry.
+        retry_exceptions: Exception types to retry.
+
+    Returns:
+        The first non-retryable response, or the last response once retries
+        are exhausted. Callers still check its status code.
+
+    Raises:
+        The last network error if every attempt failed with one.
+    """
+    for attempt in range(max_retries + 1):
+        delay = None
+        try:
+            resp = request()
+        except retry_exceptions:
+            if attempt == max_retries:
+                raise
+        else:
+            if resp.status_code not in retry_statuses or attempt == max_retries:
+                return resp
+            delay = _retry_after(resp)
+            # Release the connection back to the pool before waiting
+            resp.close()
+
+        if delay is None:
+            delay = min(cap, base * 2 ** attempt) * (1 + random.uniform(0, jitter))
+        time.sleep(min(delay, cap))
@@ -3,12 +3,16 @@ State management for tracking seen incidents.
 Currently uses a JSON file, but interface allows swapping to Redis/KV.
 """
 
-import json
+import os
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Protocol
+from typing import KeysView
 
+from . import jsonutil
 from .epic_status import StatusEvent
 
 
@@ -44,42 +48,82 @@ class StateBackend(ABC):
 class JsonFileState(StateBackend):
     """JSON file-based state storage."""
 
-    def __init__(self, file_path: Path | str | None = None):
+    def __init__(
+        self,
+        file_path: Path | str | None = None,
+        flush_interval: float = 0.0,
+        fsync: bool = True,
+    ):
+        """
+        Args:
+            file_path: State file location. Defaults to seen_incidents.json in the project root.
+            flush_interval: Minimum seconds between writes made by flush().
+            fsync: Flush each write to disk before replacing the old file.
+                Disable only where losing the last write on power failure is acceptable.
+        """
         if file_path is None:
             file_path = Path(__file__).parent.parent / "seen_incidents.json"
         self.file_path = Path(file_path)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._dirty = False
+        self._last_flush = time.monotonic()
         self._load()
 
+    def __enter__(self) -> "JsonFileState":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Persist whatever was marked seen, even if the caller failed midway,
+        # so delivered notifications are not sent again
+        self.save()
+
     def _load(self) -> None:
         """Load state from JSON file."""
-        if self.file_path.exists():
-            try:
-                with open(self.file_path, "r") as f:
-                    data = json.load(f)
-                    self.seen_ids: set[str] = set(data.get("seen_ids", []))
-                    self.fingerprints: dict[str, str] = data.get("last_updates", {})
-            except json.JSONDecodeError:
-                print("⚠️ State file corrupted, starting fresh")
-                self.seen_ids = set()
-                self.fingerprints = {}
-        else:
-            self.seen_ids = set()
-            self.fingerprints = {}
+        # Event ID -> fingerprint. Membership doubles as the "seen" set, so
+        # every check is a single dict probe.
+        self.fingerprints: dict[str, str] = {}
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return
+        try:
+            # Copy so changes to this instance don't leak into the cache
+            self.fingerprints = dict(
+                _read_state_file(self.file_path, stat.st_mtime_ns, stat.st_size)
+            )
+        except jsonutil.JSONDecodeError:
+            print("⚠️ State file corrupted, starting fresh")
+
+    @property
+    def seen_ids(self) -> KeysView[str]:
+        """IDs of all tracked events."""
+        return self.fingerprints.keys()
+
+    def is_seen(self, event_id: str) -> bool:
+        """Check if an event ID is being tracked."""
+        return event_id in self.fingerprints
 
     def is_new_event(self, event: StatusEvent) -> bool:
         """Check if this event has never been seen before."""
-        return event.id not in self.seen_ids
+        return event.id not in self.fingerprints
 
     def is_updated_event(self, event: StatusEvent) -> bool:
         """Check if this event has new updates since last seen."""
-        if event.id not in self.seen_ids:
-            return False
-        return self.fingerprints.get(event.id) != event.fingerprint
+        existing = self.fingerprints.get(event.id)
+        return existing is not None and existing != event.fingerprint
 
     def mark_seen(self, event: StatusEvent) -> None:
-        """Mark an event as seen with its current fingerprint."""
-        self.seen_ids.add(event.id)
+        """
+        Mark an event as seen with its current fingerprint.
+        A changed event moves to the end of the tracking order, so cleanup
+        evicts the events that have gone longest without an update first.
+        """
+        if self.fingerprints.get(event.id) == event.fingerprint:
+            return
+        self.fingerprints.pop(event.id, None)
         self.fingerprints[event.id] = event.fingerprint
+        self._dirty = True
 
     def cleanup(self, current_events: list[StatusEvent], max_tracked: int = 100) -> None:
         """
@@ -87,33 +131,94 @@ class JsonFileState(StateBackend):
         Keeps a limited history to prevent re-notification on API flaps.
         """
         current_ids = {e.id for e in current_events}
-        resolved_ids = self.seen_ids - current_ids
+        resolved_ids = self.fingerprints.keys() - current_ids
 
         if resolved_ids:
             print(f"🧹 Cleaning up {len(resolved_ids)} resolved incident(s)")
 
-        # Limit total tracked IDs to prevent unbounded growth
-        if len(self.seen_ids) > max_tracked:
-            all_ids = list(self.seen_ids)
-            self.seen_ids = set(all_ids[-max_tracked:])
+        # Limit total tracked IDs to prevent unbounded growth. Dicts keep
+        # insertion order, so evict the oldest resolved events first; active
+        # events are never evicted since that would re-notify them.
+        excess = len(self.fingerprints) - max_tracked
+        if excess > 0:
+            evicted = list(islice((k for k in self.fingerprints if k in resolved_ids), excess))
+            for event_id in evicted:
+                del self.fingerprints[event_id]
+            # Nothing is evicted when every tracked event is still active
+            if evicted:
+                self._dirty = True
+
+    def flush(self, force: bool = False) -> None:
+        """
+        Write pending changes, at most once per flush_interval seconds.
+        Changes held back are written by a later flush, or by save().
 
-        # Clean fingerprints for IDs we're no longer tracking
-        self.fingerprints = {
-            k: v for k, v in self.fingerprints.items() 
-            if k in self.seen_ids
-        }
+        Args:
+            force: Write now regardless of flush_interval.
+        """
+        if not self._dirty:
+            return
+        if not force and time.monotonic() - self._last_flush < self.flush_interval:
+            return
+        self._write()
 
     def save(self) -> None:
-        """Persist state to JSON file."""
+        """
+        Persist state to JSON file.
+        Does nothing if the state has not changed since it was loaded or last saved.
+        """
+        self.flush(force=True)
+
+    def _write(self) -> None:
+        """
+        Write the state file.
+        The file is replaced atomically so a crash mid-write cannot corrupt it,
+        and a failed write leaves no temporary file behind.
+        """
         data = {
-            "seen_ids": list(self.seen_ids),
+            "seen_ids": list(self.fingerprints),
             "last_updates": self.fingerprints,
             "last_checked": datetime.now(timezone.utc).isoformat(),
         }
-        with open(self.file_path, "w") as f:
-            json.dump(data, f, indent=2)
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                # Indented, since the file is committed to git and edited by
+                # hand; readable diffs are worth the few extra bytes
+                f.write(jsonutil.dumps(data, indent=True))
+                if self.fsync:
+                    # Make sure the new contents are on disk before they
+                    # replace the old file, or a power loss could leave it empty
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        # A rewrite can land within the same mtime tick and keep the same
+        # size, so don't rely on the cache key to notice our own writes
+        _read_state_file.cache_clear()
+        self._dirty = False
+        self._last_flush = time.monotonic()
 
     @property
     def tracked_count(self) -> int:
         """Number of incidents currently being tracked."""
-        return len(self.seen_ids)
+        return len(self.fingerprints)
+
+
+@lru_cache(maxsize=8)
+def _read_state_file(file_path: Path, mtime_ns: int, size: int) -> dict[str, str]:
+    """
+    Parse a state file into an event ID -> fingerprint dict.
+
+    Cached on the file's modification time and size, so constructing several
+    states from an unchanged file only parses it once. Corrupted files raise
+    and are therefore never cached.
+    """
+    data = jsonutil.loads(file_path.read_bytes())
+    last_updates = data.get("last_updates", {})
+    return {
+        event_id: last_updates.get(event_id, "")
+        for event_id in data.get("seen_ids", [])
+    }
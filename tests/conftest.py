@@ -7,8 +7,29 @@ from tempfile import NamedTemporaryFile, TemporaryDirectory
 
 import pytest
 
-from src.epic_status import StatusEvent, StatusUpdate, Component, EventType
+from src.epic_status import StatusEvent, StatusUpdate, Component, EventType, clear_cache
 from src.filters import FilterConfig
+from src.notifiers.telegram import _telegram_env
+
+
+@pytest.fixture(autouse=True)
+def _reset_response_cache():
+    """Keep cached API responses from leaking between tests."""
+    clear_cache()
+    yield
+    clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_sleep(monkeypatch):
+    """Skip retry backoff delays so failing requests don't slow the suite."""
+    monkeypatch.setattr("src.retry.time.sleep", lambda seconds: None)
+
+
+@pytest.fixture(autouse=True)
+def _no_fsync(monkeypatch):
+    """Skip flushing state files to disk; tests don't need crash durability."""
+    monkeypatch.setattr("src.state.os.fsync", lambda fd: None)
 
 
 @pytest.fixture
@@ -163,8 +184,10 @@ def mock_env_vars(monkeypatch):
     def _set_env(**kwargs):
         for key, value in kwargs.items():
             monkeypatch.setenv(key, value)
+        _telegram_env.cache_clear()
         return kwargs
-    return _set_env
+    yield _set_env
+    _telegram_env.cache_clear()
 
 
 @pytest.fixture
@@ -173,4 +196,6 @@ def clear_env_vars(monkeypatch):
     def _clear(*var_names):
         for var in var_names:
             monkeypatch.delenv(var, raising=False)
-    return _clear
+        _telegram_env.cache_clear()
+    yield _clear
+    _telegram_env.cache_clear()
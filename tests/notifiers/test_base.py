@@ -0,0 +1,39 @@
+"""Tests for notifiers/base.py - Notifier interface defaults."""
+
+import pytest
+
+from src.notifiers import Notifier
+
+
+class RecordingNotifier(Notifier):
+    """Notifier that records what it was asked to send."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_new_event(self, event):
+        self.sent.append(("new", event.id))
+        return True
+
+    def send_event_update(self, event):
+        self.sent.append(("update", event.id))
+        return event.is_incident
+
+
+@pytest.mark.unit
+class TestDefaultSendBatch:
+    """Test the per-event send_batch fallback."""
+
+    def test_send_batch_sends_each_event(self, sample_incident, sample_maintenance):
+        """Test each event is sent individually, in order."""
+        notifier = RecordingNotifier()
+        results = notifier.send_batch([sample_incident, sample_maintenance])
+        assert results == [True, True]
+        assert notifier.sent == [("new", sample_incident.id), ("new", sample_maintenance.id)]
+
+    def test_send_batch_updates(self, sample_incident, sample_maintenance):
+        """Test is_update routes to send_event_update and keeps per-event results."""
+        notifier = RecordingNotifier()
+        results = notifier.send_batch([sample_incident, sample_maintenance], is_update=True)
+        assert results == [True, False]
+        assert [kind for kind, _ in notifier.sent] == ["update", "update"]
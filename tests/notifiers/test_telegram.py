@@ -1,9 +1,12 @@
 """Tests for notifiers/telegram.py - Telegram notification backend."""
 
+import asyncio
+import json
 import os
 from unittest.mock import Mock, patch
 
 import pytest
+import requests
 import responses
 
 from src.notifiers.telegram import TelegramNotifier
@@ -149,6 +152,30 @@ class TestFormatMessage:
         # Should not crash, message should be valid
         assert len(message) > 0
 
+    def test_format_message_escapes_html(self):
+        """Test event text is escaped so Telegram can parse the HTML markup."""
+        notifier = TelegramNotifier()
+
+        event = StatusEvent(
+            id="escape",
+            name="Rocket League <Ranked> & Casual",
+            status="investigating",
+            impact="minor",
+            shortlink="https://stspg.io/test",
+            created_at="2024-01-15T10:00:00Z",
+            updated_at="2024-01-15T10:00:00Z",
+            updates=[
+                StatusUpdate(id="u1", status="investigating", body="Queue times > 5 min", created_at="2024-01-15T10:00:00Z")
+            ],
+            components=[Component(id="c1", name="Trading & Items", status="degraded_performance")],
+            event_type=EventType.INCIDENT,
+        )
+
+        message = notifier._format_message(event, is_update=False)
+        assert "<b>Rocket League &lt;Ranked&gt; &amp; Casual</b>" in message
+        assert "<i>Queue times &gt; 5 min</i>" in message
+        assert "Trading &amp; Items" in message
+
 
 @pytest.mark.integration
 class TestSendMessage:
@@ -212,6 +239,50 @@ class TestSendMessage:
         success = notifier._send_message("Test message")
         assert success is False
 
+    @responses.activate
+    def test_send_message_read_timeout_not_retried(self):
+        """Test a read timeout is not retried, since the message may have been delivered."""
+        notifier = TelegramNotifier(token="test-token", chat_id="12345", timeout=1)
+
+        responses.add(
+            responses.POST,
+            "https://api.telegram.org/bottest-token/sendMessage",
+            body=requests.ReadTimeout("Read timed out"),
+        )
+
+        success = notifier._send_message("Test message")
+        assert success is False
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_send_message_server_error_not_retried(self):
+        """Test a 5xx is not retried, since the message may have been processed."""
+        notifier = TelegramNotifier(token="test-token", chat_id="12345")
+
+        responses.add(
+            responses.POST,
+            "https://api.telegram.org/bottest-token/sendMessage",
+            status=502,
+        )
+
+        success = notifier._send_message("Test message")
+        assert success is False
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_send_message_retries_connect_failure_and_rate_limit(self):
+        """Test failures where the message was not accepted are retried."""
+        notifier = TelegramNotifier(token="test-token", chat_id="12345")
+
+        url = "https://api.telegram.org/bottest-token/sendMessage"
+        responses.add(responses.POST, url, body=requests.ConnectTimeout("Connect timed out"))
+        responses.add(responses.POST, url, status=429, headers={"Retry-After": "1"})
+        responses.add(responses.POST, url, json={"ok": True}, status=200)
+
+        success = notifier._send_message("Test message")
+        assert success is True
+        assert len(responses.calls) == 3
+
     def test_send_message_not_configured(self, sample_incident):
         """Test sending when not configured prints to console."""
         notifier = TelegramNotifier()  # No token or chat_id
@@ -287,6 +358,119 @@ class TestSendEventUpdate:
         assert success is True
 
 
+@pytest.mark.unit
+class TestSendAsync:
+    """Test the async send wrappers."""
+
+    @responses.activate
+    def test_send_async_concurrently(self, sample_incident, sample_maintenance):
+        """Test async sends can be gathered from a running event loop."""
+        notifier = TelegramNotifier(token="test-token", chat_id="12345")
+
+        responses.add(
+            responses.POST,
+            "https://api.telegram.org/bottest-token/sendMessage",
+            json={"ok": True},
+            status=200,
+        )
+
+        async def send_all():
+            return await asyncio.gather(
+                notifier.send_new_event_async(sample_incident),
+                notifier.send_event_update_async(sample_maintenance),
+            )
+
+        assert asyncio.run(send_all()) == [True, True]
+        assert len(responses.calls) == 2
+
+
+@pytest.mark.unit
+class TestSendBatch:
+    """Test send_batch method."""
+
+    @responses.activate
+    def test_send_batch_single_message(self, sample_incident, sample_fortnite_incident):
+        """Test several events are sent in one message."""
+        notifier = TelegramNotifier(token="test-token", chat_id="12345")
+        
+        responses.add(
+            responses.POST,
+            "https://api.telegram.org/bottest-token/sendMessage",
+            json={"ok": True},
+            status=200,
+        )
+        
+        results = notifier.send_batch([sample_incident, sample_fortnite_incident])
+        assert results == [True, True]
+        assert len(responses.calls) == 1
+        body = responses.calls[0].request.body.decode()
+        assert "Epic Games Store Login Issues" in body
+        assert "Fortnite Matchmaking Issues" in body
+        assert json.loads(body)["text"].count(TelegramNotifier.BATCH_SEPARATOR) == 1
+
+    @responses.activate
+    def test_send_batch_splits_at_length_limit(self, sample_incident, sample_fortnite_incident, monkeypatch):
+        """Test events that don't fit together are sent separately."""
+        notifier = TelegramNotifier(token="test-token", chat_id="12345")
+        monkeypatch.setattr(TelegramNotifier, "MAX_MESSAGE_LENGTH", 300)
+        
+        responses.add(
+            responses.POST,
+            "https://api.telegram.org/bottest-token/sendMessage",
+            json={"ok": True},
+            status=200,
+        )
+        responses.add(
+            responses.POST,
+            "https://api.telegram.org/bottest-token/sendMessage",
+            json={"ok": False},
+            status=400,
+        )
+        
+        results = notifier.send_batch([sample_incident, sample_fortnite_incident])
+        assert results == [True, False]
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_send_batch_rejected_message_resent_individually(
+        self, sample_incident, sample_fortnite_incident, sample_maintenance
+    ):
+        """Test one event Telegram rejects doesn't mark the rest of its message unsent."""
+        notifier = TelegramNotifier(token="test-token", chat_id="12345")
+        url = "https://api.telegram.org/bottest-token/sendMessage"
+
+        responses.add(responses.POST, url, json={"ok": False}, status=400)
+        responses.add(responses.POST, url, json={"ok": True}, status=200)
+        responses.add(responses.POST, url, json={"ok": False}, status=400)
+        responses.add(responses.POST, url, json={"ok": True}, status=200)
+
+        results = notifier.send_batch([sample_incident, sample_fortnite_incident, sample_maintenance])
+        assert results == [True, False, True]
+        assert len(responses.calls) == 4
+
+    @responses.activate
+    def test_send_batch_server_error_not_resent(self, sample_incident, sample_fortnite_incident):
+        """Test a combined message that may have been delivered is not re-sent per event."""
+        notifier = TelegramNotifier(token="test-token", chat_id="12345")
+
+        responses.add(
+            responses.POST,
+            "https://api.telegram.org/bottest-token/sendMessage",
+            status=502,
+        )
+
+        results = notifier.send_batch([sample_incident, sample_fortnite_incident])
+        assert results == [False, False]
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_send_batch_empty(self):
+        """Test an empty batch sends nothing."""
+        notifier = TelegramNotifier(token="test-token", chat_id="12345")
+        assert notifier.send_batch([]) == []
+        assert len(responses.calls) == 0
+
+
 @pytest.mark.unit
 class TestTelegramNotifierConfig:
     """Test TelegramNotifier configuration."""
@@ -304,6 +488,13 @@ class TestTelegramNotifierConfig:
         assert notifier.token == "env-token"
         assert notifier.chat_id == "env-chat-id"
 
+    def test_env_read_once(self, mock_env_vars, monkeypatch):
+        """Test environment credentials are cached across instances."""
+        mock_env_vars(TELEGRAM_TOKEN="env-token", TELEGRAM_CHAT_ID="env-chat-id")
+        TelegramNotifier()
+        monkeypatch.setenv("TELEGRAM_TOKEN", "changed-token")
+        assert TelegramNotifier().token == "env-token"
+
     def test_is_configured_true(self):
         """Test is_configured returns True when both token and chat_id set."""
         notifier = TelegramNotifier(token="test-token", chat_id="12345")
@@ -323,3 +514,17 @@ class TestTelegramNotifierConfig:
         """Test is_configured returns False when both missing."""
         notifier = TelegramNotifier()
         assert notifier.is_configured is False
+
+    def test_connection_pool_size(self):
+        """Test the Telegram connection pool size is configurable."""
+        notifier = TelegramNotifier(token="test-token", chat_id="12345", connection_pool_size=16)
+        adapter = notifier._session.get_adapter("https://api.telegram.org")
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 16
+
+    def test_context_manager_closes_session(self):
+        """Test leaving the context manager closes the HTTP session."""
+        notifier = TelegramNotifier(token="test-token", chat_id="12345")
+        with patch.object(notifier._session, "close") as mock_close:
+            with notifier:
+                pass
+            mock_close.assert_called_once()
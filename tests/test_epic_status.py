@@ -1,17 +1,25 @@
 """Tests for epic_status.py - API client and data models."""
 
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
 from pathlib import Path
+from unittest.mock import Mock, patch
 
 import pytest
 import responses
 
+from src import jsonutil
 from src.epic_status import (
     Component,
     EventType,
+    Impact,
     StatusEvent,
     StatusUpdate,
+    _PARSE_CACHE,
     _parse_event,
+    clear_cache,
     fetch_active_maintenances,
     fetch_all_active_events,
     fetch_all_events,
@@ -51,6 +59,24 @@ class TestStatusEventProperties:
         """Test component_names property."""
         assert sample_incident.component_names == ["Epic Games Store", "Launcher"]
 
+    def test_impact_rank(self, sample_incident):
+        """Test impact strings are parsed into ordered Impact values."""
+        assert sample_incident.impact_rank is Impact.MAJOR
+        assert Impact.MINOR < sample_incident.impact_rank < Impact.CRITICAL
+
+    def test_impact_rank_unknown(self):
+        """Test unrecognized impact strings rank below every known level."""
+        event = _parse_event({"id": "x", "impact": "catastrophic"}, EventType.INCIDENT)
+        assert event.impact_rank is Impact.UNKNOWN
+        assert event.impact_rank < Impact.NONE
+
+    def test_event_is_immutable(self, sample_incident):
+        """Test events can't be modified after parsing."""
+        with pytest.raises(FrozenInstanceError):
+            sample_incident.status = "resolved"
+        with pytest.raises(FrozenInstanceError):
+            sample_incident.updates[0].body = "changed"
+
     def test_is_maintenance(self, sample_maintenance):
         """Test is_maintenance property."""
         assert sample_maintenance.is_maintenance is True
@@ -151,6 +177,43 @@ class TestParseEvent:
         assert event.components[0].name == "Service1"
         assert event.components[1].name == ""  # Default empty string
 
+    def test_parse_event_reuses_unchanged_event(self, sample_incident_data):
+        """Test parsing identical data twice returns the cached event."""
+        first = _parse_event(sample_incident_data, EventType.INCIDENT)
+        second = _parse_event(dict(sample_incident_data), EventType.INCIDENT)
+        assert second is first
+
+    def test_parse_event_cache_sees_status_change(self, sample_incident_data):
+        """Test a status change is reparsed even if updated_at is unchanged."""
+        first = _parse_event(sample_incident_data, EventType.INCIDENT)
+        changed = _parse_event({**sample_incident_data, "status": "resolved"}, EventType.INCIDENT)
+        assert changed is not first
+        assert changed.status == "resolved"
+
+    def test_parse_event_cache_is_bounded(self, sample_incident_data, monkeypatch):
+        """Test the oldest parsed events are evicted past the size limit."""
+        monkeypatch.setattr("src.epic_status.PARSE_CACHE_SIZE", 2)
+        for i in range(3):
+            _parse_event({**sample_incident_data, "id": f"incident-{i}"}, EventType.INCIDENT)
+        assert [key[1] for key in _PARSE_CACHE] == ["incident-1", "incident-2"]
+
+    def test_parse_event_cache_thread_safe(self, sample_incident_data, monkeypatch, request):
+        """Test concurrent parses evicting from a full cache don't raise."""
+        monkeypatch.setattr("src.epic_status.PARSE_CACHE_SIZE", 4)
+        # Switch threads as often as possible to make interleavings likely
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        request.addfinalizer(lambda: sys.setswitchinterval(interval))
+
+        def parse_many(worker):
+            for i in range(2000):
+                _parse_event({**sample_incident_data, "id": f"incident-{worker}-{i}"}, EventType.INCIDENT)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            for future in [executor.submit(parse_many, worker) for worker in range(3)]:
+                future.result()
+        assert len(_PARSE_CACHE) == 4
+
 
 @pytest.mark.integration
 class TestFetchFunctions:
@@ -315,8 +378,13 @@ class TestFetchFunctions:
         assert events == []
 
     @responses.activate
-    def test_fetch_invalid_json(self):
+    @pytest.mark.parametrize("backend", ["orjson", "stdlib"])
+    def test_fetch_invalid_json(self, backend, monkeypatch):
         """Test handling of invalid JSON response."""
+        if backend == "orjson":
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(jsonutil, "orjson", None)
         responses.add(
             responses.GET,
             INCIDENTS_URL,
@@ -326,8 +394,9 @@ class TestFetchFunctions:
         )
         
         events = fetch_incidents()
-        # Should handle JSON decode error gracefully
-        assert isinstance(events, list)
+        # Should handle JSON decode error gracefully with either backend
+        assert events == []
+        assert events.stale
 
     @responses.activate
     def test_fetch_missing_key_in_response(self):
@@ -341,3 +410,203 @@ class TestFetchFunctions:
         
         events = fetch_incidents()
         assert events == []
+
+    @responses.activate
+    def test_fetch_large_response_stream_parsed(self, sample_incident_data, monkeypatch):
+        """Test responses over the threshold are stream-parsed with ijson."""
+        ijson = pytest.importorskip("ijson")
+        monkeypatch.delenv("EPIC_STATUS_STREAM_PARSE", raising=False)
+        monkeypatch.setattr("src.epic_status.STREAM_PARSE_THRESHOLD", 0)
+        body = json.dumps({"incidents": [sample_incident_data]})
+        responses.add(
+            responses.GET,
+            INCIDENTS_URL,
+            body=body,
+            status=200,
+            content_type="application/json",
+            headers={"Content-Length": str(len(body))},
+        )
+        items = Mock(wraps=ijson.items)
+        monkeypatch.setattr(ijson, "items", items)
+        
+        events = fetch_incidents()
+        items.assert_called_once()
+        assert len(events) == 1
+        assert events[0].id == "test-incident-123"
+        assert events[0].fingerprint == "investigating:update-1"
+
+    @responses.activate
+    @pytest.mark.parametrize("setting, streamed", [("1", True), ("0", False)])
+    def test_fetch_stream_parse_env_override(self, sample_incident_data, monkeypatch, setting, streamed):
+        """Test EPIC_STATUS_STREAM_PARSE forces stream parsing on or off."""
+        ijson = pytest.importorskip("ijson")
+        monkeypatch.setenv("EPIC_STATUS_STREAM_PARSE", setting)
+        # Without the override, this threshold would stream every response
+        monkeypatch.setattr("src.epic_status.STREAM_PARSE_THRESHOLD", -1)
+        responses.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+        )
+        items = Mock(wraps=ijson.items)
+        monkeypatch.setattr(ijson, "items", items)
+
+        events = fetch_incidents()
+        assert items.called is streamed
+        assert len(events) == 1
+
+    @responses.activate
+    def test_fetch_truncated_stream(self, sample_incident_data, monkeypatch):
+        """Test a connection dropped mid-body while stream parsing is handled."""
+        ijson = pytest.importorskip("ijson")
+        from urllib3.exceptions import ProtocolError
+
+        monkeypatch.setenv("EPIC_STATUS_STREAM_PARSE", "1")
+        responses.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+        )
+        monkeypatch.setattr(ijson, "items", Mock(side_effect=ProtocolError("Connection broken")))
+
+        events = fetch_incidents()
+        assert events == []
+        assert events.stale
+
+    @responses.activate
+    def test_fetch_malformed_content_length(self, sample_incident_data, monkeypatch):
+        """Test a malformed Content-Length falls back to the non-streaming parser."""
+        ijson = pytest.importorskip("ijson")
+        monkeypatch.delenv("EPIC_STATUS_STREAM_PARSE", raising=False)
+        responses.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+            headers={"Content-Length": "bogus"},
+        )
+        items = Mock(wraps=ijson.items)
+        monkeypatch.setattr(ijson, "items", items)
+
+        events = fetch_incidents()
+        items.assert_not_called()
+        assert len(events) == 1
+
+
+@pytest.mark.integration
+class TestResponseCache:
+    """Test TTL caching and revalidation in the fetch layer."""
+
+    @responses.activate
+    def test_fetch_served_from_cache_within_ttl(self, sample_incident_data):
+        """Test a second fetch within the TTL does not hit the network."""
+        responses.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+        )
+
+        first = fetch_incidents()
+        second = fetch_incidents()
+        assert len(responses.calls) == 1
+        assert [e.id for e in second] == [e.id for e in first]
+
+    @responses.activate
+    def test_fetch_ttl_zero_disables_cache(self, sample_incident_data):
+        """Test ttl=0 always refetches."""
+        responses.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+        )
+
+        fetch_incidents(ttl=0)
+        fetch_incidents(ttl=0)
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_fetch_revalidates_with_etag(self, sample_incident_data):
+        """Test expired entries are revalidated and reused on 304."""
+        responses.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+            headers={"ETag": '"v1"'},
+        )
+        responses.add(responses.GET, INCIDENTS_URL, status=304)
+
+        fetch_incidents(ttl=0)
+        events = fetch_incidents(ttl=0)
+
+        assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+        assert len(events) == 1
+        assert events[0].id == "test-incident-123"
+
+    @responses.activate
+    def test_fetch_returns_cached_on_304(self, sample_incident_data):
+        """Test a 304 to If-Modified-Since reuses cached events without parsing."""
+        last_modified = "Mon, 15 Jan 2024 10:00:00 GMT"
+        responses.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+            headers={"Last-Modified": last_modified},
+        )
+        responses.add(responses.GET, INCIDENTS_URL, status=304)
+
+        first = fetch_incidents(ttl=0)
+        with patch("src.epic_status._parse_response") as parse:
+            events = fetch_incidents(ttl=0)
+
+        assert responses.calls[1].request.headers["If-Modified-Since"] == last_modified
+        assert "If-None-Match" not in responses.calls[1].request.headers
+        parse.assert_not_called()
+        assert events == first
+
+    @responses.activate
+    def test_fetch_error_falls_back_to_cache(self, sample_incident_data):
+        """Test a failed fetch returns the last cached events."""
+        responses.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+        )
+        responses.add(responses.GET, INCIDENTS_URL, status=500)
+
+        assert not fetch_incidents(ttl=0).stale
+        events = fetch_incidents(ttl=0)
+        assert len(events) == 1
+        assert events.stale
+
+    @responses.activate
+    def test_fetch_all_events_stale_if_any_endpoint_fails(self):
+        """Test a single failed endpoint marks the merged result stale."""
+        responses.add(responses.GET, INCIDENTS_URL, status=500)
+        responses.add(responses.GET, MAINTENANCE_ACTIVE_URL, json={"scheduled_maintenances": []}, status=200)
+        responses.add(responses.GET, MAINTENANCE_UPCOMING_URL, json={"scheduled_maintenances": []}, status=200)
+
+        events = fetch_all_events()
+        assert events == []
+        assert events.stale
+
+    @responses.activate
+    def test_clear_cache(self, sample_incident_data):
+        """Test clear_cache forces a refetch."""
+        responses.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+        )
+
+        fetch_incidents()
+        clear_cache()
+        fetch_incidents()
+        assert len(responses.calls) == 2
@@ -2,8 +2,10 @@
 
 import json
 import os
+from dataclasses import FrozenInstanceError
 from pathlib import Path
 from tempfile import NamedTemporaryFile
+from unittest.mock import patch
 
 import pytest
 
@@ -37,6 +39,32 @@ class TestFilterConfigMatches:
         config = FilterConfig(services=["fortnite"])
         assert config.matches(sample_fortnite_incident) is True
 
+    def test_config_is_immutable(self):
+        """Test filter settings can't be changed after the matchers are built."""
+        config = FilterConfig(services=["Fortnite"])
+        with pytest.raises(FrozenInstanceError):
+            config.min_impact = "critical"
+
+    def test_config_keeps_snapshot_of_keyword_lists(self, sample_incident):
+        """Test changing the list a config was built from doesn't affect it."""
+        services = ["Fortnite"]
+        config = FilterConfig(services=services)
+        services.append("Launcher")
+
+        assert config.services == ("Fortnite",)
+        assert config.matches(sample_incident) is False
+
+    def test_duplicate_keywords_match_case_insensitively(self, sample_fortnite_incident, sample_incident):
+        """Test keywords differing only in case still match, and match nothing else."""
+        config = FilterConfig(services=["Fortnite", "fortnite", "Rocket League", "ROCKET LEAGUE"])
+        assert config.matches(sample_fortnite_incident) is True
+        assert config.matches(sample_incident) is False
+
+    def test_single_keyword_with_regex_characters(self, sample_fortnite_incident):
+        """Test a lone keyword is matched literally, not as a pattern."""
+        assert FilterConfig(services=["Fortnite"]).matches(sample_fortnite_incident) is True
+        assert FilterConfig(services=["Fort.ite"]).matches(sample_fortnite_incident) is False
+
     def test_matches_service_in_component_name(self, sample_incident):
         """Test matching service in component names."""
         config = FilterConfig(services=["Launcher"])
@@ -137,6 +165,23 @@ class TestFilterConfigMatches:
         )
         assert config.matches(sample_incident) is True
 
+    def test_matches_always_include_bypasses_type_and_impact(self, sample_incident):
+        """Test always_include_keywords also bypass event type and impact filters."""
+        config = FilterConfig(
+            event_types="maintenance",
+            min_impact="critical",
+            always_include_keywords=["Epic Games Store"],
+        )
+        assert config.matches(sample_incident) is True
+
+    def test_matches_exclude_wins_over_always_include(self, sample_incident):
+        """Test exclude_keywords take precedence over always_include_keywords."""
+        config = FilterConfig(
+            always_include_keywords=["Epic Games Store"],
+            exclude_keywords=["Login"],
+        )
+        assert config.matches(sample_incident) is False
+
     def test_matches_exclude_keywords(self, sample_fortnite_incident):
         """Test exclude_keywords filter."""
         config = FilterConfig(
@@ -208,6 +253,8 @@ class TestFilterConfigMatches:
         config = FilterConfig(min_impact="major")
         # Unknown impact should be treated as lowest priority
         assert config.matches(unknown_impact) is False
+        # ...but still pass when no minimum impact is set
+        assert FilterConfig(min_impact="none").matches(unknown_impact) is True
 
 
 @pytest.mark.unit
@@ -226,16 +273,16 @@ class TestLoadFilterConfig:
         temp_config_file.write_text(json.dumps(config_data))
         
         config = load_filter_config(temp_config_file)
-        assert config.services == ["Fortnite"]
+        assert config.services == ("Fortnite",)
         assert config.min_impact == "major"
         assert config.event_types == "incidents"
-        assert config.always_include_keywords == ["LEGO"]
-        assert config.exclude_keywords == ["test"]
+        assert config.always_include_keywords == ("LEGO",)
+        assert config.exclude_keywords == ("test",)
 
     def test_load_default_when_file_not_found(self):
         """Test default config when file doesn't exist."""
         config = load_filter_config(Path("/nonexistent/file.json"))
-        assert config.services == []
+        assert config.services == ()
         assert config.min_impact == "none"
         assert config.event_types == "all"
 
@@ -245,7 +292,7 @@ class TestLoadFilterConfig:
         monkeypatch.setattr(Path, "exists", lambda self: False)
         
         config = load_filter_config()
-        assert config.services == []
+        assert config.services == ()
         assert config.min_impact == "none"
 
     def test_load_from_env_var_watch_services(self, mock_env_vars, clear_env_vars):
@@ -254,7 +301,7 @@ class TestLoadFilterConfig:
         mock_env_vars(WATCH_SERVICES="Fortnite, Rocket League, Epic Games Store")
         
         config = load_filter_config()
-        assert config.services == ["Fortnite", "Rocket League", "Epic Games Store"]
+        assert config.services == ("Fortnite", "Rocket League", "Epic Games Store")
         assert config.min_impact == "none"  # Defaults
 
     def test_load_from_env_var_config_file(self, temp_config_file, mock_env_vars):
@@ -264,7 +311,7 @@ class TestLoadFilterConfig:
         mock_env_vars(CONFIG_FILE=str(temp_config_file))
         
         config = load_filter_config()
-        assert config.services == ["FromEnvFile"]
+        assert config.services == ("FromEnvFile",)
 
     def test_load_invalid_json(self, temp_config_file):
         """Test handling of invalid JSON in config file."""
@@ -272,7 +319,15 @@ class TestLoadFilterConfig:
         
         config = load_filter_config(temp_config_file)
         # Should return defaults on error
-        assert config.services == []
+        assert config.services == ()
+        assert config.min_impact == "none"
+
+    def test_load_invalid_min_impact(self, temp_config_file):
+        """Test an unknown min_impact falls back to defaults."""
+        temp_config_file.write_text(json.dumps({"services": ["Fortnite"], "min_impact": "severe"}))
+        
+        config = load_filter_config(temp_config_file)
+        assert config.services == ()
         assert config.min_impact == "none"
 
     def test_load_partial_config(self, temp_config_file):
@@ -280,10 +335,53 @@ class TestLoadFilterConfig:
         temp_config_file.write_text(json.dumps({"services": ["Fortnite"]}))
         
         config = load_filter_config(temp_config_file)
-        assert config.services == ["Fortnite"]
+        assert config.services == ("Fortnite",)
         assert config.min_impact == "none"  # Default
         assert config.event_types == "all"  # Default
 
+    def test_load_null_keyword_lists(self, temp_config_file, sample_incident):
+        """Test null keyword lists in the config file are treated as empty."""
+        temp_config_file.write_text(json.dumps({
+            "services": None,
+            "always_include_keywords": None,
+            "exclude_keywords": None,
+        }))
+
+        config = load_filter_config(temp_config_file)
+        assert config.matches(sample_incident) is True
+
+    def test_load_reuses_config_when_unchanged(self, temp_config_file):
+        """Test an unchanged config file is not re-parsed."""
+        temp_config_file.write_text(json.dumps({"services": ["Fortnite"]}))
+
+        first = load_filter_config(temp_config_file)
+        second = load_filter_config(temp_config_file)
+        assert second is first
+
+    def test_load_reloads_when_file_changes(self, temp_config_file):
+        """Test a modified config file is picked up."""
+        temp_config_file.write_text(json.dumps({"services": ["Fortnite"]}))
+        load_filter_config(temp_config_file)
+
+        temp_config_file.write_text(json.dumps({"services": ["Rocket League"]}))
+        stat = temp_config_file.stat()
+        os.utime(temp_config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        config = load_filter_config(temp_config_file)
+        assert config.services == ("Rocket League",)
+
+    def test_load_does_not_cache_invalid_config(self, temp_config_file):
+        """Test a config that failed to load is retried on the next call."""
+        temp_config_file.write_text("{ invalid json }")
+        stat = temp_config_file.stat()
+        assert load_filter_config(temp_config_file).services == ()
+
+        # Fix the file but keep the same mtime
+        temp_config_file.write_text(json.dumps({"services": ["Fortnite"]}))
+        os.utime(temp_config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert load_filter_config(temp_config_file).services == ("Fortnite",)
+
 
 @pytest.mark.unit
 class TestFilterEvents:
@@ -314,6 +412,14 @@ class TestFilterEvents:
         filtered = filter_events(events, config)
         assert len(filtered) == 0
 
+    def test_filter_events_uses_matches(self, sample_incident):
+        """Test filtering goes through FilterConfig.matches, so overriding it takes effect."""
+        with patch.object(FilterConfig, "matches", return_value=False) as mock_matches:
+            filtered = filter_events([sample_incident], FilterConfig())
+
+        assert filtered == []
+        mock_matches.assert_called_once_with(sample_incident)
+
     def test_filter_events_empty_list(self):
         """Test filtering empty event list."""
         config = FilterConfig()
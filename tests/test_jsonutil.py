@@ -0,0 +1,44 @@
+"""Tests for jsonutil.py - JSON backend helpers."""
+
+import json
+
+import pytest
+
+from src import jsonutil
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run a test against both the orjson and stdlib backends."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(jsonutil, "orjson", None)
+    return request.param
+
+
+@pytest.mark.unit
+class TestJsonUtil:
+    """Test loads/dumps across backends."""
+
+    def test_roundtrip(self, backend):
+        """Test data survives a dumps/loads roundtrip."""
+        data = {"seen_ids": ["a", "b"], "last_updates": {"a": "investigating:u1"}, "name": "Fortnite ⚡"}
+        encoded = jsonutil.dumps(data)
+        assert isinstance(encoded, bytes)
+        assert jsonutil.loads(encoded) == data
+
+    def test_indent_output_is_valid_json(self, backend):
+        """Test indented output parses with the stdlib and is multi-line."""
+        encoded = jsonutil.dumps({"a": [1, 2]}, indent=True)
+        assert b"\n" in encoded
+        assert json.loads(encoded) == {"a": [1, 2]}
+
+    def test_loads_accepts_str(self, backend):
+        """Test loads accepts text as well as bytes."""
+        assert jsonutil.loads('{"a": 1}') == {"a": 1}
+
+    def test_invalid_json_raises_decode_error(self, backend):
+        """Test both backends raise the shared JSONDecodeError."""
+        with pytest.raises(jsonutil.JSONDecodeError):
+            jsonutil.loads(b"invalid json{")
@@ -8,41 +8,64 @@ import pytest
 import responses
 
 from src.state import JsonFileState
-from src.epic_status import BASE_URL, INCIDENTS_URL, MAINTENANCE_ACTIVE_URL, MAINTENANCE_UPCOMING_URL
-from src.filters import FilterConfig
+from src.epic_status import StatusEvent, BASE_URL, INCIDENTS_URL, MAINTENANCE_ACTIVE_URL, MAINTENANCE_UPCOMING_URL
+from src.filters import FilterConfig, filter_events
 
 
-@pytest.mark.integration
-class TestPollStatusWorkflow:
-    """Test the main polling workflow."""
+class _StubNotifier:
+    """Notifier stand-in that records batches and reports every event as `sent`."""
 
-    @responses.activate
-    @patch('src.notifiers.telegram.TelegramNotifier.send_new_event')
-    @patch('src.notifiers.telegram.TelegramNotifier.send_event_update')
-    def test_full_workflow_new_event(self, mock_send_update, mock_send_new, temp_state_file, sample_incident_data):
-        """Test full workflow with a new event."""
-        # Mock API responses
-        responses.add(
-            responses.GET,
-            INCIDENTS_URL,
-            json={"incidents": [sample_incident_data]},
-            status=200,
-        )
-        responses.add(
+    def __init__(self, sent: bool = True):
+        self.sent = sent
+        self.batches: list[tuple[list[StatusEvent], bool]] = []
+        self.close_count = 0
+
+    def send_batch(self, events: list[StatusEvent], is_update: bool = False) -> list[bool]:
+        self.batches.append((list(events), is_update))
+        return [self.sent] * len(events)
+
+    def close(self) -> None:
+        self.close_count += 1
+
+
+@pytest.fixture
+def api_mock():
+    """
+    Mock the status API with no maintenances.
+    Tests register the incidents response they need on the returned mock.
+    """
+    with responses.RequestsMock() as mock:
+        mock.add(
             responses.GET,
             MAINTENANCE_ACTIVE_URL,
             json={"scheduled_maintenances": []},
             status=200,
         )
-        responses.add(
+        mock.add(
             responses.GET,
             MAINTENANCE_UPCOMING_URL,
             json={"scheduled_maintenances": []},
             status=200,
         )
+        yield mock
+
+
+@pytest.mark.integration
+class TestPollStatusWorkflow:
+    """Test the main polling workflow."""
+
+    def test_full_workflow_new_event(self, api_mock, temp_state_file, sample_incident_data):
+        """Test full workflow with a new event."""
+        # Mock API responses
+        api_mock.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+        )
         
-        # Mock successful notification
-        mock_send_new.return_value = True
+        # Stub successful notification
+        notifier = _StubNotifier(sent=True)
         
         # Import and run main function
         from poll_status import main
@@ -50,22 +73,24 @@ class TestPollStatusWorkflow:
         # Mock filter config to return default
         with patch('poll_status.load_filter_config', return_value=FilterConfig()), \
              patch('poll_status.JsonFileState', return_value=JsonFileState(temp_state_file)), \
-             patch('poll_status.TelegramNotifier', return_value=Mock(send_new_event=mock_send_new, send_event_update=mock_send_update)):
+             patch('poll_status.TelegramNotifier', return_value=notifier):
             
             result = main()
             assert result == 0
         
-        # Verify notification was sent
-        mock_send_new.assert_called_once()
+        # Verify a single batch of new events was sent
+        assert len(notifier.batches) == 1
+        events, is_update = notifier.batches[0]
+        assert [e.id for e in events] == ["test-incident-123"]
+        assert is_update is False
+        assert notifier.close_count == 1
         
         # Verify state was saved
         state = JsonFileState(temp_state_file)
         state._load()
         assert "test-incident-123" in state.seen_ids
 
-    @responses.activate
-    @patch('src.notifiers.telegram.TelegramNotifier.send_event_update')
-    def test_full_workflow_updated_event(self, mock_send_update, populated_state_file, sample_incident_data):
+    def test_full_workflow_updated_event(self, api_mock, populated_state_file, sample_incident_data):
         """Test full workflow with an updated event."""
         state = JsonFileState(populated_state_file)
         old_fingerprint = state.fingerprints["test-incident-123"]
@@ -81,106 +106,112 @@ class TestPollStatusWorkflow:
         })
         
         # Mock API responses
-        responses.add(
+        api_mock.add(
             responses.GET,
             INCIDENTS_URL,
             json={"incidents": [updated_incident_data]},
             status=200,
         )
-        responses.add(
-            responses.GET,
-            MAINTENANCE_ACTIVE_URL,
-            json={"scheduled_maintenances": []},
-            status=200,
-        )
-        responses.add(
-            responses.GET,
-            MAINTENANCE_UPCOMING_URL,
-            json={"scheduled_maintenances": []},
-            status=200,
-        )
         
-        mock_send_update.return_value = True
+        notifier = _StubNotifier(sent=True)
         
         from poll_status import main
         
         with patch('poll_status.load_filter_config', return_value=FilterConfig()), \
              patch('poll_status.JsonFileState', return_value=JsonFileState(populated_state_file)), \
-             patch('poll_status.TelegramNotifier', return_value=Mock(send_new_event=Mock(return_value=True), send_event_update=mock_send_update)):
+             patch('poll_status.TelegramNotifier', return_value=notifier):
             
             result = main()
             assert result == 0
         
         # Verify update notification was sent
-        mock_send_update.assert_called_once()
+        assert len(notifier.batches) == 1
+        assert notifier.batches[0][1] is True
 
-    @responses.activate
-    def test_full_workflow_no_new_events(self, populated_state_file, sample_incident_data):
+    def test_full_workflow_no_new_events(self, api_mock, populated_state_file, sample_incident_data):
         """Test workflow when no new or updated events."""
         # Mock API responses with same event
-        responses.add(
+        api_mock.add(
             responses.GET,
             INCIDENTS_URL,
             json={"incidents": [sample_incident_data]},
             status=200,
         )
-        responses.add(
-            responses.GET,
-            MAINTENANCE_ACTIVE_URL,
-            json={"scheduled_maintenances": []},
-            status=200,
-        )
-        responses.add(
-            responses.GET,
-            MAINTENANCE_UPCOMING_URL,
-            json={"scheduled_maintenances": []},
-            status=200,
-        )
         
-        mock_notifier = Mock()
-        mock_notifier.send_new_event.return_value = True
-        mock_notifier.send_event_update.return_value = True
+        notifier = _StubNotifier(sent=True)
         
         from poll_status import main
         
         with patch('poll_status.load_filter_config', return_value=FilterConfig()), \
              patch('poll_status.JsonFileState', return_value=JsonFileState(populated_state_file)), \
-             patch('poll_status.TelegramNotifier', return_value=mock_notifier):
+             patch('poll_status.TelegramNotifier', return_value=notifier):
             
             result = main()
             assert result == 0
         
         # Should not send any notifications
-        mock_notifier.send_new_event.assert_not_called()
-        mock_notifier.send_event_update.assert_not_called()
+        assert notifier.batches == []
 
-    @responses.activate
-    def test_dry_run_mode(self, temp_state_file, sample_incident_data):
-        """Test dry-run mode still updates state."""
-        responses.add(
+    def test_unchanged_events_skip_filtering(self, api_mock, populated_state_file, sample_incident_data):
+        """Test events already seen with the same fingerprint are not re-filtered."""
+        api_mock.add(
             responses.GET,
             INCIDENTS_URL,
             json={"incidents": [sample_incident_data]},
             status=200,
         )
-        responses.add(
+
+        from poll_status import main
+
+        with patch('poll_status.load_filter_config', return_value=FilterConfig()), \
+             patch('poll_status.JsonFileState', return_value=JsonFileState(populated_state_file)), \
+             patch('poll_status.TelegramNotifier', return_value=_StubNotifier(sent=True)), \
+             patch('poll_status.filter_events', wraps=filter_events) as mock_filter:
+
+            result = main()
+            assert result == 0
+
+        filtered = [event for call in mock_filter.call_args_list for event in call.args[0]]
+        assert filtered == []
+        assert "test-incident-123" in JsonFileState(populated_state_file).seen_ids
+
+    def test_tracked_event_excluded_by_narrowed_filter(self, api_mock, populated_state_file,
+                                                       sample_incident_data, capsys):
+        """Test a tracked event the filters now exclude is not notified but stays tracked."""
+        api_mock.add(
             responses.GET,
-            MAINTENANCE_ACTIVE_URL,
-            json={"scheduled_maintenances": []},
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
             status=200,
         )
-        responses.add(
+
+        notifier = _StubNotifier(sent=True)
+
+        from poll_status import main
+
+        with patch('poll_status.load_filter_config', return_value=FilterConfig(services=["Unreal Engine"])), \
+             patch('poll_status.JsonFileState', return_value=JsonFileState(populated_state_file)), \
+             patch('poll_status.TelegramNotifier', return_value=notifier):
+
+            result = main()
+            assert result == 0
+
+        assert notifier.batches == []
+        assert "(including already tracked events)" in capsys.readouterr().out
+        assert "test-incident-123" in JsonFileState(populated_state_file).seen_ids
+
+    def test_dry_run_mode(self, api_mock, temp_state_file, sample_incident_data):
+        """Test dry-run mode still updates state."""
+        api_mock.add(
             responses.GET,
-            MAINTENANCE_UPCOMING_URL,
-            json={"scheduled_maintenances": []},
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
             status=200,
         )
         
         from poll_status import main
         
-        mock_notifier = Mock()
-        mock_notifier.send_new_event.return_value = False  # Notification fails
-        mock_notifier.send_event_update.return_value = False
+        notifier = _StubNotifier(sent=False)  # Notification fails
         
         # Create a mock args object with dry_run=True
         mock_args = Mock()
@@ -188,7 +219,7 @@ class TestPollStatusWorkflow:
         
         with patch('poll_status.load_filter_config', return_value=FilterConfig()), \
              patch('poll_status.JsonFileState', return_value=JsonFileState(temp_state_file)), \
-             patch('poll_status.TelegramNotifier', return_value=mock_notifier), \
+             patch('poll_status.TelegramNotifier', return_value=notifier), \
              patch('poll_status.argparse.ArgumentParser.parse_args', return_value=mock_args):
             
             result = main()
@@ -199,48 +230,33 @@ class TestPollStatusWorkflow:
         state._load()
         assert "test-incident-123" in state.seen_ids
 
-    @responses.activate
-    def test_filtering_works(self, temp_state_file, sample_incident_data):
+    def test_filtering_works(self, api_mock, temp_state_file, sample_incident_data):
         """Test that filtering is applied correctly."""
-        responses.add(
+        api_mock.add(
             responses.GET,
             INCIDENTS_URL,
             json={"incidents": [sample_incident_data]},
             status=200,
         )
-        responses.add(
-            responses.GET,
-            MAINTENANCE_ACTIVE_URL,
-            json={"scheduled_maintenances": []},
-            status=200,
-        )
-        responses.add(
-            responses.GET,
-            MAINTENANCE_UPCOMING_URL,
-            json={"scheduled_maintenances": []},
-            status=200,
-        )
         
         # Filter config that excludes this incident
         filter_config = FilterConfig(services=["Unreal Engine"])
         
-        mock_notifier = Mock()
-        mock_notifier.send_new_event.return_value = True
+        notifier = _StubNotifier(sent=True)
         
         from poll_status import main
         
         with patch('poll_status.load_filter_config', return_value=filter_config), \
              patch('poll_status.JsonFileState', return_value=JsonFileState(temp_state_file)), \
-             patch('poll_status.TelegramNotifier', return_value=mock_notifier):
+             patch('poll_status.TelegramNotifier', return_value=notifier):
             
             result = main()
             assert result == 0
         
         # Should not send notification due to filtering
-        mock_notifier.send_new_event.assert_not_called()
+        assert notifier.batches == []
 
-    @responses.activate
-    def test_state_cleanup_on_save(self, temp_state_file, sample_incident_data):
+    def test_state_cleanup_on_save(self, api_mock, temp_state_file, sample_incident_data):
         """Test that state cleanup happens during save."""
         # Create state with old events
         state_data = {
@@ -254,30 +270,18 @@ class TestPollStatusWorkflow:
         temp_state_file.write_text(json.dumps(state_data))
         
         # New API response with different event
-        responses.add(
+        api_mock.add(
             responses.GET,
             INCIDENTS_URL,
             json={"incidents": [sample_incident_data]},
             status=200,
         )
-        responses.add(
-            responses.GET,
-            MAINTENANCE_ACTIVE_URL,
-            json={"scheduled_maintenances": []},
-            status=200,
-        )
-        responses.add(
-            responses.GET,
-            MAINTENANCE_UPCOMING_URL,
-            json={"scheduled_maintenances": []},
-            status=200,
-        )
         
         from poll_status import main
         
         with patch('poll_status.load_filter_config', return_value=FilterConfig()), \
              patch('poll_status.JsonFileState', return_value=JsonFileState(temp_state_file)), \
-             patch('poll_status.TelegramNotifier', return_value=Mock(send_new_event=Mock(return_value=True), send_event_update=Mock(return_value=True))):
+             patch('poll_status.TelegramNotifier', return_value=_StubNotifier(sent=True)):
             
             result = main()
             assert result == 0
@@ -287,3 +291,44 @@ class TestPollStatusWorkflow:
         saved_state._load()
         # New event should be in seen_ids
         assert "test-incident-123" in saved_state.seen_ids
+
+    def test_cleanup_skipped_when_fetch_fails(self, api_mock, temp_state_file, sample_incident_data):
+        """Test tracked events are not cleaned up when an endpoint fails."""
+        api_mock.add(responses.GET, INCIDENTS_URL, status=503)
+
+        from poll_status import main
+
+        state = JsonFileState(temp_state_file)
+        with patch('poll_status.load_filter_config', return_value=FilterConfig()), \
+             patch('poll_status.JsonFileState', return_value=state), \
+             patch.object(state, 'cleanup') as mock_cleanup, \
+             patch('poll_status.TelegramNotifier', return_value=_StubNotifier(sent=True)):
+
+            result = main()
+            assert result == 0
+
+        mock_cleanup.assert_not_called()
+
+    def test_state_saved_once_even_if_cleanup_fails(self, api_mock, temp_state_file, sample_incident_data):
+        """Test events marked seen are written in one save even when a later step fails."""
+        api_mock.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+        )
+
+        from poll_status import main
+
+        state = JsonFileState(temp_state_file)
+        with patch('poll_status.load_filter_config', return_value=FilterConfig()), \
+             patch('poll_status.JsonFileState', return_value=state), \
+             patch.object(state, 'cleanup', side_effect=RuntimeError("boom")), \
+             patch.object(state, '_write', wraps=state._write) as mock_write, \
+             patch('poll_status.TelegramNotifier', return_value=_StubNotifier(sent=True)):
+
+            with pytest.raises(RuntimeError):
+                main()
+
+        mock_write.assert_called_once()
+        assert "test-incident-123" in JsonFileState(temp_state_file).seen_ids
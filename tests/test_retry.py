@@ -0,0 +1,100 @@
+"""Tests for retry.py - HTTP retry with backoff."""
+
+from unittest.mock import Mock
+
+import pytest
+import requests
+import responses
+
+from src import retry as retry_module
+from src.retry import retry
+from src.epic_status import INCIDENTS_URL, fetch_incidents
+
+URL = "https://example.com/api"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping."""
+    delays = []
+    monkeypatch.setattr(retry_module.time, "sleep", delays.append)
+    return delays
+
+
+@pytest.mark.unit
+class TestRetry:
+    """Test the retry helper."""
+
+    @responses.activate
+    def test_success_first_try(self, sleeps):
+        """Test a successful response is returned without retrying."""
+        responses.add(responses.GET, URL, json={}, status=200)
+
+        resp = retry(lambda: requests.get(URL))
+        assert resp.status_code == 200
+        assert len(responses.calls) == 1
+        assert sleeps == []
+
+    @responses.activate
+    def test_retries_server_error(self, sleeps):
+        """Test 5xx responses are retried until one succeeds."""
+        responses.add(responses.GET, URL, status=503)
+        responses.add(responses.GET, URL, json={}, status=200)
+
+        resp = retry(lambda: requests.get(URL))
+        assert resp.status_code == 200
+        assert len(responses.calls) == 2
+        assert len(sleeps) == 1
+
+    @responses.activate
+    def test_client_error_not_retried(self, sleeps):
+        """Test 4xx responses other than 429 are returned immediately."""
+        responses.add(responses.GET, URL, status=400)
+
+        resp = retry(lambda: requests.get(URL))
+        assert resp.status_code == 400
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_gives_up_after_max_retries(self, sleeps):
+        """Test the last response is returned once retries run out."""
+        responses.add(responses.GET, URL, status=500)
+
+        resp = retry(lambda: requests.get(URL), max_retries=2)
+        assert resp.status_code == 500
+        assert len(responses.calls) == 3
+        assert len(sleeps) == 2
+
+    @responses.activate
+    def test_honors_retry_after(self, sleeps):
+        """Test a 429 waits for the Retry-After the server asked for."""
+        responses.add(responses.GET, URL, status=429, headers={"Retry-After": "7"})
+        responses.add(responses.GET, URL, json={}, status=200)
+
+        retry(lambda: requests.get(URL))
+        assert sleeps == [7.0]
+
+    def test_backoff_is_exponential_and_capped(self, sleeps, monkeypatch):
+        """Test delays double each attempt and never exceed the cap."""
+        monkeypatch.setattr(retry_module.random, "uniform", lambda a, b: 0)
+        request = Mock(side_effect=ConnectionError("Network error"))
+
+        with pytest.raises(ConnectionError):
+            retry(request, max_retries=4, base=1.0, cap=5.0)
+        assert request.call_count == 5
+        assert sleeps == [1.0, 2.0, 4.0, 5.0]
+
+    @responses.activate
+    def test_fetch_recovers_from_transient_error(self, sample_incident_data):
+        """Test fetches succeed when a transient failure clears up."""
+        responses.add(responses.GET, INCIDENTS_URL, status=502)
+        responses.add(
+            responses.GET,
+            INCIDENTS_URL,
+            json={"incidents": [sample_incident_data]},
+            status=200,
+        )
+
+        events = fetch_incidents()
+        assert len(events) == 1
+        assert not events.stale
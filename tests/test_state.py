@@ -2,6 +2,7 @@
 
 import json
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -34,6 +35,24 @@ class TestJsonFileState:
         assert state.seen_ids == set()
         assert state.fingerprints == {}
 
+    def test_init_reuses_parsed_unchanged_file(self, populated_state_file, sample_maintenance):
+        """Test an unchanged file is parsed once and each state gets its own copy."""
+        with patch("src.state.jsonutil.loads", wraps=json.loads) as mock_loads:
+            first = JsonFileState(populated_state_file)
+            second = JsonFileState(populated_state_file)
+
+        assert mock_loads.call_count == 1
+        first.mark_seen(sample_maintenance)
+        assert sample_maintenance.id not in second.seen_ids
+
+    def test_init_rereads_after_save(self, populated_state_file, sample_maintenance):
+        """Test a state loaded after a save sees the saved changes."""
+        state = JsonFileState(populated_state_file)
+        state.mark_seen(sample_maintenance)
+        state.save()
+
+        assert sample_maintenance.id in JsonFileState(populated_state_file).seen_ids
+
     def test_is_new_event_true(self, empty_state_file, sample_incident):
         """Test is_new_event returns True for unseen event."""
         state = JsonFileState(empty_state_file)
@@ -201,6 +220,14 @@ class TestJsonFileState:
         assert saved_data["last_updates"][sample_incident.id] == sample_incident.fingerprint
         assert "last_checked" in saved_data
 
+    def test_save_writes_indented_json(self, empty_state_file, sample_incident):
+        """Test the state file is indented, so git diffs of it stay readable."""
+        state = JsonFileState(empty_state_file)
+        state.mark_seen(sample_incident)
+        state.save()
+
+        assert f'\n    "{sample_incident.id}"' in empty_state_file.read_text()
+
     def test_tracked_count_property(self, populated_state_file):
         """Test tracked_count property."""
         state = JsonFileState(populated_state_file)
@@ -214,3 +241,162 @@ class TestJsonFileState:
         # Should handle missing "last_updates" gracefully
         assert "event-1" in state.seen_ids
         assert isinstance(state.fingerprints, dict)
+
+    def test_is_seen(self, populated_state_file, sample_incident):
+        """Test is_seen looks up tracked IDs."""
+        state = JsonFileState(populated_state_file)
+        assert state.is_seen(sample_incident.id) is True
+        assert state.is_seen("unknown-id") is False
+
+    def test_seen_ids_is_live_view(self, empty_state_file, sample_incident):
+        """Test seen_ids is a view of the tracked IDs rather than a copy."""
+        state = JsonFileState(empty_state_file)
+        seen_ids = state.seen_ids
+        assert isinstance(seen_ids, type({}.keys()))
+
+        state.mark_seen(sample_incident)
+        assert sample_incident.id in seen_ids
+
+    def test_save_skipped_when_unchanged(self, populated_state_file, sample_incident):
+        """Test save does not rewrite the file when nothing changed."""
+        original = populated_state_file.read_text()
+        state = JsonFileState(populated_state_file)
+        state.mark_seen(sample_incident)  # Same fingerprint as on disk
+        state.save()
+
+        assert populated_state_file.read_text() == original
+
+    def test_save_replaces_file_atomically(self, empty_state_file, sample_incident):
+        """Test save leaves no temporary file behind."""
+        state = JsonFileState(empty_state_file)
+        state.mark_seen(sample_incident)
+        state.save()
+
+        tmp_path = empty_state_file.with_name(empty_state_file.name + ".tmp")
+        assert not tmp_path.exists()
+        assert sample_incident.id in json.loads(empty_state_file.read_text())["seen_ids"]
+
+    def test_save_failure_keeps_original(self, populated_state_file, sample_incident, sample_maintenance):
+        """Test a failed save keeps the old file, removes the temp file and stays dirty."""
+        original = populated_state_file.read_text()
+        state = JsonFileState(populated_state_file)
+        state.mark_seen(sample_maintenance)
+
+        with patch("src.state.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                state.save()
+
+        tmp_path = populated_state_file.with_name(populated_state_file.name + ".tmp")
+        assert not tmp_path.exists()
+        assert populated_state_file.read_text() == original
+
+        # The change is still pending and is written by the next save
+        state.save()
+        assert sample_maintenance.id in json.loads(populated_state_file.read_text())["seen_ids"]
+
+    def test_interrupted_write_keeps_original(self, populated_state_file, sample_maintenance):
+        """Test a write that fails before the replace leaves the old file intact."""
+        original = populated_state_file.read_text()
+        state = JsonFileState(populated_state_file)
+        state.mark_seen(sample_maintenance)
+
+        with patch("src.state.os.fsync", side_effect=OSError("I/O error")):
+            with pytest.raises(OSError):
+                state.save()
+
+        assert populated_state_file.read_text() == original
+
+    def test_save_without_fsync(self, empty_state_file, sample_incident):
+        """Test fsync can be turned off for callers that do not need durability."""
+        state = JsonFileState(empty_state_file, fsync=False)
+        state.mark_seen(sample_incident)
+
+        with patch("src.state.os.fsync") as mock_fsync:
+            state.save()
+
+        mock_fsync.assert_not_called()
+        assert sample_incident.id in json.loads(empty_state_file.read_text())["seen_ids"]
+
+    def test_flush_is_debounced(self, empty_state_file, sample_incident):
+        """Test flush waits for flush_interval unless forced."""
+        state = JsonFileState(empty_state_file, flush_interval=60)
+        state.mark_seen(sample_incident)
+
+        state.flush()
+        assert json.loads(empty_state_file.read_text())["seen_ids"] == []
+
+        state.flush(force=True)
+        assert json.loads(empty_state_file.read_text())["seen_ids"] == [sample_incident.id]
+
+    def test_context_manager_saves(self, empty_state_file, sample_incident):
+        """Test leaving the context manager persists pending changes."""
+        with JsonFileState(empty_state_file, flush_interval=60) as state:
+            state.mark_seen(sample_incident)
+
+        assert json.loads(empty_state_file.read_text())["seen_ids"] == [sample_incident.id]
+
+    def test_cleanup_evicts_oldest_resolved_first(self, temp_state_file):
+        """Test cleanup trims the oldest resolved events and keeps active ones."""
+        many_ids = [f"event-{i}" for i in range(10)]
+        data = {
+            "seen_ids": many_ids,
+            "last_updates": {id: "status:update" for id in many_ids},
+        }
+        temp_state_file.write_text(json.dumps(data))
+        state = JsonFileState(temp_state_file)
+
+        active = StatusEvent(
+            id="event-0",
+            name="Still Active",
+            status="investigating",
+            impact="minor",
+            shortlink="https://stspg.io/test",
+            created_at="2024-01-15T10:00:00Z",
+            updated_at="2024-01-15T10:00:00Z",
+            updates=[],
+            components=[],
+            event_type=EventType.INCIDENT,
+        )
+        state.cleanup([active], max_tracked=5)
+
+        assert list(state.seen_ids) == ["event-0", "event-6", "event-7", "event-8", "event-9"]
+
+    def test_cleanup_without_evictions_keeps_state_clean(self, temp_state_file):
+        """Test cleanup doesn't mark state dirty when all tracked events are still active."""
+        ids = [f"event-{i}" for i in range(3)]
+        data = {"seen_ids": ids, "last_updates": {id: "status:update" for id in ids}}
+        temp_state_file.write_text(json.dumps(data))
+        state = JsonFileState(temp_state_file)
+
+        active = [
+            StatusEvent(
+                id=event_id,
+                name="Still Active",
+                status="investigating",
+                impact="minor",
+                shortlink="https://stspg.io/test",
+                created_at="2024-01-15T10:00:00Z",
+                updated_at="2024-01-15T10:00:00Z",
+                updates=[],
+                components=[],
+                event_type=EventType.INCIDENT,
+            )
+            for event_id in ids
+        ]
+        state.cleanup(active, max_tracked=2)
+
+        assert list(state.seen_ids) == ids
+        assert state._dirty is False
+
+    def test_updated_event_moves_to_end_of_tracking_order(self, temp_state_file, sample_incident):
+        """Test an updated event is evicted after events that have not changed."""
+        ids = [sample_incident.id, "event-0", "event-1", "event-2"]
+        data = {"seen_ids": ids, "last_updates": {id: "status:update" for id in ids}}
+        temp_state_file.write_text(json.dumps(data))
+        state = JsonFileState(temp_state_file)
+
+        state.mark_seen(sample_incident)
+        assert list(state.seen_ids) == ["event-0", "event-1", "event-2", sample_incident.id]
+
+        state.cleanup([], max_tracked=2)
+        assert list(state.seen_ids) == ["event-2", sample_incident.id]